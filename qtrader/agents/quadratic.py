@@ -19,16 +19,28 @@ class QuadraticAgent(Agent):
         self.w = self.action_space.sample()
 
     def observe(self, observation, action, reward, done, next_observation):
-        self.memory.append(observation.values)
+        prices = self._prices(observation)
+        # windowed observations carry their own history
+        if np.ndim(prices) == 2:
+            return
+        self.memory.append(np.asarray(prices))
 
     def act(self, observation):
-        # deque -> np.array, for easy math
-        memory = np.array(self.memory)
+        prices = self._prices(observation)
+        if np.ndim(prices) == 2:
+            # windowed observation, (window, M)
+            memory = np.asarray(prices)
+        else:
+            # deque -> np.array, for easy math
+            memory = np.array(self.memory)
+        # nothing observed yet, e.g. first step of `run`
+        if len(memory) == 0:
+            return self.w
         # number of assets
-        M = len(observation)
+        M = np.shape(prices)[-1]
         # expected returns vector
         mu = np.mean(memory, axis=0).reshape(M, 1)
-        if len(self.memory) != self.memory.maxlen:
+        if len(memory) < self.memory.maxlen:
             sigma = np.eye(M)
         else:
             # empirical covariance matrix
@@ -40,6 +52,15 @@ class QuadraticAgent(Agent):
             pass
         return self.w
 
+    @staticmethod
+    def _prices(observation):
+        """Prices of `observation` of `qtrader.envs`, row or
+        (window, M) view, as passed by `qtrader.utils.gym.run`,
+        or the prices themselves."""
+        if isinstance(observation, dict):
+            return observation['prices']
+        return observation
+
     def _J(self, J):
         if J is "sharpe_ratio":
             return qtrader.agents.pretrainer.objectives.sharpe_ratio
@@ -1,3 +1,5 @@
+from collections import deque
+
 import numpy as np
 import pandas as pd
 
@@ -20,37 +22,42 @@ class VARAgent(Agent):
         # fit model
         self.model = self.model.fit(maxlags=max_order,
                                     ic='aic')
-        # memory used to cache observations
-        self.memory = pd.DataFrame(columns=df.columns)
+        # memory used to cache the last returns, of the model lag order
+        self.memory = deque(maxlen=max(self.model.k_ar, 1))
         # policy
-        self.policy = 'softmax'
+        self.policy = policy
 
     def observe(self, observation, action, reward, done, next_observation):
-        self.memory.append([observation['returns'],
-                            next_observation['returns']])
+        # windowed observations carry their own history
+        if np.ndim(next_observation['returns']) == 2:
+            return
+        self.memory.append(np.asarray(next_observation['returns']))
 
     def act(self, observation):
         _returns = observation['returns']
-        if len(self.memory) == 0:
+        if np.ndim(_returns) == 2:
+            # windowed observation, (window, M), unknown
+            # returns before the first date skipped
+            history = _returns[~np.isnan(_returns).any(axis=1)]
+        else:
+            history = np.array(self.memory)
+        if len(history) < self.memory.maxlen:
             # random sample
             _values = np.random.uniform(0, 1, self.model.coefs.shape[-1])
         else:
             # forecast one step returns
-            _values = self.model.forecast(self.memory.dropna().values, 1)[0]
-        # softmax policy
-        if self.policy == 'softmax':
-            # to pandas.Series
-            _action = pd.Series(_values,
-                                index=_returns.index,
-                                name=_returns.name)
-            return softmax(_action)
+            _values = self.model.forecast(
+                history[-self.memory.maxlen:], 1)[0]
         # LONG best stock policy
-        elif self.policy == 'best':
+        if self.policy == 'best':
             # one-hot vector
-            _action = np.zeros_like(_values).ravel()
-            _action[np.argmax(_values)] = 1.0
-            # to pandas.Series
-            _action = pd.Series(_action,
-                                index=_returns.index,
-                                name=_returns.name)
-            return _action
+            _values = np.eye(len(_values))[np.argmax(_values)]
+        # softmax policy
+        else:
+            _values = softmax(_values)
+        # to pandas.Series, for row observations
+        if isinstance(_returns, pd.Series):
+            return pd.Series(_values,
+                             index=_returns.index,
+                             name=_returns.name)
+        return _values
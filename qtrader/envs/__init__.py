@@ -1,3 +1,5 @@
 import qtrader.envs.data_loader
 from qtrader.envs.trading import TradingEnv
+from qtrader.envs.vec import VecEnv
+from qtrader.envs.stream import StreamEnv
 import qtrader.envs.spaces
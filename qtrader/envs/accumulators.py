@@ -0,0 +1,137 @@
+import numpy as np
+import typing
+
+from qtrader.utils.online import DifferentialSharpeRatio, MaxDrawdown, Moments
+
+
+class Accumulators:
+    """Running reward & risk statistics of `A` agents,
+    updated in O(1) per step, by the estimators of
+    `qtrader.utils.online` broadcasting over agents.
+
+    Attributes
+    ----------
+    count: numpy.ndarray
+        Number of updates
+    wealth: numpy.ndarray
+        Wealth level
+    peak: numpy.ndarray
+        Running maximum of wealth level, from the initial one
+    drawdown: numpy.ndarray
+        Drawdown, difference between peak and wealth level
+    max_drawdown: numpy.ndarray
+        Running maximum of drawdown
+    mean: numpy.ndarray
+        Mean of returns, Welford's algorithm
+    std: numpy.ndarray
+        Standard deviation of returns, Welford's algorithm
+    sharpe_ratio: numpy.ndarray
+        Sharpe ratio of returns, as `qtrader.utils.econometric.sharpe_ratio`
+    differential_sharpe_ratio: numpy.ndarray
+        Differential Sharpe ratio of last returns, Moody & Saffell (1998)
+    """
+
+    # state variables of the estimators, one entry per agent
+    _fields = {
+        '_moments': ('count', 'mean', '_m2'),
+        '_drawdown': ('count', 'wealth', 'peak', 'drawdown', 'max_drawdown'),
+        '_differential': ('count', '_A', '_B', 'differential_sharpe_ratio')
+    }
+
+    def __init__(self, num_agents: int, eta: float = 0.01):
+        """Constructs an `Accumulators` object.
+
+        Parameters
+        ----------
+        num_agents: int
+            Number of agents `A`
+        eta: float, optional
+            Adaptation rate of the differential Sharpe ratio
+            exponential moving moments
+        """
+        self.eta = eta
+        self._moments = Moments()
+        # episodes start from cash, a peak of wealth
+        self._drawdown = MaxDrawdown(initial=True)
+        self._differential = DifferentialSharpeRatio(eta)
+        for name, fields in self._fields.items():
+            estimator = getattr(self, name)
+            for field in fields:
+                setattr(estimator, field,
+                        np.full(num_agents, getattr(estimator, field)))
+
+    def update(self, returns: np.ndarray):
+        """Update statistics with (A,) vector of `returns`."""
+        self._moments.update(returns)
+        self._drawdown.update(returns)
+        self._differential.update(returns)
+
+    @property
+    def count(self) -> np.ndarray:
+        """Number of updates."""
+        return self._moments.count
+
+    @property
+    def wealth(self) -> np.ndarray:
+        """Wealth level."""
+        return self._drawdown.wealth
+
+    @property
+    def peak(self) -> np.ndarray:
+        """Running maximum of wealth level."""
+        return self._drawdown.peak
+
+    @property
+    def drawdown(self) -> np.ndarray:
+        """Drawdown, difference between peak and wealth level."""
+        return self._drawdown.drawdown
+
+    @property
+    def max_drawdown(self) -> np.ndarray:
+        """Running maximum of drawdown."""
+        return self._drawdown.max_drawdown
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean of returns."""
+        return self._moments.mean
+
+    @property
+    def std(self) -> np.ndarray:
+        """Standard deviation of returns, unbiased."""
+        return self._moments.std
+
+    @property
+    def sharpe_ratio(self) -> np.ndarray:
+        """Sharpe ratio of returns."""
+        return self._moments.sharpe_ratio
+
+    @property
+    def differential_sharpe_ratio(self) -> np.ndarray:
+        """Differential Sharpe ratio of last returns."""
+        return self._differential.differential_sharpe_ratio
+
+    def take(self, indices: typing.Sequence[int], num_agents: int):
+        """Copy statistics of agents `indices` into the leading
+        entries of fresh `Accumulators` of `num_agents`."""
+        accumulators = type(self)(num_agents, self.eta)
+        indices = np.asarray(indices, dtype=int)
+        for name, fields in self._fields.items():
+            source, target = getattr(self, name), getattr(accumulators, name)
+            for field in fields:
+                getattr(target, field)[:len(indices)] = \
+                    getattr(source, field)[indices]
+        return accumulators
+
+    def info(self) -> dict:
+        """Current statistics, per field."""
+        return {
+            'wealth': self.wealth.copy(),
+            'peak': self.peak.copy(),
+            'drawdown': self.drawdown.copy(),
+            'max_drawdown': self.max_drawdown.copy(),
+            'mean': self.mean.copy(),
+            'std': self.std,
+            'sharpe_ratio': self.sharpe_ratio,
+            'differential_sharpe_ratio': self.differential_sharpe_ratio.copy()
+        }
@@ -1,17 +1,151 @@
 import numpy as np
 import pandas as pd
+import matplotlib.dates
 import matplotlib.pyplot as plt
 import typing
+import copy
 
 import gym
 
 import qtrader
 from qtrader.agents.base import Agent
+from qtrader.envs.accumulators import Accumulators
+import qtrader.envs.cache
+from qtrader.envs.shared import Descriptor, SharedPanel
 
 from abc import abstractmethod
 
 
-class BaseEnv(gym.Env):
+class AgentsMixin:
+    """Registration of agents and interface of their actions & rewards,
+    shared by `BaseEnv` & `qtrader.envs.StreamEnv`, around the records
+    hooks `_add_agent`, `_remove_agent` & `_clear_agents`.
+    """
+
+    @abstractmethod
+    def _add_agent(self, name: str):
+        """Add fresh records of agent `name`, after the registered ones."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _remove_agent(self, name: str):
+        """Remove records of agent `name`, keeping the order of others."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _clear_agents(self):
+        """Remove records & running statistics of all agents."""
+        raise NotImplementedError
+
+    def _validate_agents(self):
+        """Check agents' availability."""
+        if len(self.agents) == 0:
+            raise RuntimeError('no agent registed in the environment')
+
+    def _validate_actions(self, actions: np.ndarray,
+                          mask: typing.Optional[np.ndarray] = None
+                          ) -> np.ndarray:
+        """Check (..., M) portfolio vectors, projecting
+        invalid ones onto the action space if `repair`.
+
+        Parameters
+        ----------
+        actions: numpy.ndarray
+            (..., M) portfolio vectors
+        mask: numpy.ndarray, optional
+            (..., M) available assets, defaults to the
+            current mask of the action space
+
+        Returns
+        -------
+        valid: numpy.ndarray
+            (...,) boolean mask of valid portfolio vectors
+        """
+        valid = self.action_space.contains_many(actions, mask=mask)
+        if self.repair and not valid.all():
+            if mask is not None:
+                mask = np.broadcast_to(mask, actions.shape)[~valid]
+            actions[~valid] = self.action_space.project(actions[~valid],
+                                                        mask)
+            valid[:] = True
+        return valid
+
+    def _parse_actions(self, action: typing.Union[np.ndarray,
+                                                  typing.Dict[str, object]]
+                       ) -> np.ndarray:
+        """Valid (A, M) matrix of portfolio vectors of `action`,
+        per agent name or in order of registration."""
+        # verify interface
+        if isinstance(action, dict):
+            if action.keys() != self.agents.keys():
+                raise ValueError(
+                    'invalid interface of actions provided'
+                )
+            A = np.array([action[name] for name in self.agents],
+                         dtype=float)
+        else:
+            A = np.array(action, dtype=float)
+        if A.shape != (len(self.agents), len(self.universe)):
+            raise ValueError(
+                'invalid shape of `action` attempted: %s' % (A.shape,)
+            )
+        # action validity check
+        valid = self._validate_actions(A)
+        if not valid.all():
+            raise ValueError(
+                'invalid `action` attempted: %s' % (A[~valid][0])
+            )
+        return A
+
+    def _format_step(self, action, reward: np.ndarray,
+                     info: dict) -> typing.Tuple[object, dict]:
+        """Reward function & interface of the (A,) `reward` and
+        running statistics `info`, as the interface of `action`."""
+        # alternative reward function
+        if self.reward != 'returns':
+            reward = info[self.reward]
+        if isinstance(action, dict):
+            reward = dict(zip(self.agents, reward))
+            info = {key: dict(zip(self.agents, value))
+                    for key, value in info.items()}
+        return reward, info
+
+    #######
+    # API
+    #######
+
+    def register(self, agent: Agent):
+        """Register an `agent` to the environment."""
+        # verify interface
+        if not hasattr(agent, 'name'):
+            raise ValueError('agent must have a `name` attribute.')
+        # verify uniqueness
+        if agent.name not in self.agents:
+            self._add_agent(agent.name)
+            # keep running statistics of already registered agents
+            A = len(self.agents)
+            self._accumulators = self._accumulators.take(range(A - 1), A)
+
+    def unregister(self, agent: typing.Optional[Agent]):
+        """Unregister an `agent` from the environment."""
+        # when agent=None, unregister all agents
+        if agent is None:
+            self._clear_agents()
+            return None
+        # --------------------------------------------------------------------------
+        # verify interface
+        if not hasattr(agent, 'name'):
+            raise ValueError('agent must have a `name` attribute.')
+        # verify availability
+        if agent.name in self.agents:
+            a = list(self.agents).index(agent.name)
+            self._accumulators = self._accumulators.take(
+                [b for b in range(len(self.agents)) if b != a],
+                len(self.agents) - 1)
+            self._remove_agent(agent.name)
+
+
+class BaseEnv(AgentsMixin, gym.Env):
     """OpenAI Gym Base Trading Environment.
 
     Attributes
@@ -29,8 +163,20 @@ class BaseEnv(gym.Env):
         Historic prices for `universe`
     returns: pandas.DataFrame
         Historic relative (percentage) returns for `universe`
-    agents: list
-        Registered agents that compete in the environment
+    agents: dict
+        Records of registered agents that compete in the environment,
+        views into the columnar (A, T, M) actions & rewards tensors
+    window: int
+        Lookback of windowed observations, `None` for single rows
+    repair: bool
+        Project invalid actions onto the action space, instead of raising
+    reward: str
+        Reward function, 'returns' or 'differential_sharpe_ratio'
+    ragged: bool
+        Keep history of assets listed over part of it, masking
+        them out of the action space while not listed
+    listings: pandas.DataFrame
+        Listing intervals of assets, for `ragged` environments
 
     Methods
     -------
@@ -38,6 +184,12 @@ class BaseEnv(gym.Env):
         The agent takes a step in the environment
     reset()
         Resets the state of the environment and returns an initial observation
+    share()
+        Publish prices & returns into shared memory
+    fork()
+        Branch off the current state of the environment
+    restore(snapshot)
+        Return to the state of a forked environment
     render()
         Present real-time data on a dashboard
     register(agent)
@@ -47,30 +199,105 @@ class BaseEnv(gym.Env):
     class Record:
         """Local data structure for actions and rewards records.
 
+        Records are kept in preallocated contiguous `numpy.ndarray`
+        buffers of shape (T, M), written by integer counter, while the
+        `pandas.DataFrame` tables are only built on access. Records of
+        registered agents are views into the environment's columnar
+        (A, T, M) tensors.
+
         Attributes
         ----------
         actions: pandas.DataFrame
             Table of actions performed by agent
         rewards: pandas.DataFrame
             Table of rewards received by agent
+        pnl: pandas.Series
+            Wealth level of agent
         """
 
-        def __init__(self, index, columns):
+        def __init__(self, index, columns,
+                     actions=None, rewards=None, wealth=None):
+            self.index = index
+            self.columns = columns
             # records of actions
-            self.actions = pd.DataFrame(
-                columns=columns, index=index, dtype=float)
-            self.actions.iloc[0] = np.zeros(len(columns))
-            self.actions.iloc[0]['CASH'] = 1.0
+            if actions is None:
+                actions = np.full((len(index), len(columns)), np.nan,
+                                  dtype=qtrader.framework.DTYPE)
+                actions[0] = 0.0
+                if 'CASH' in columns:
+                    actions[0, columns.index('CASH')] = 1.0
+            self._actions = actions
             # records of rewards
-            self.rewards = pd.DataFrame(
-                columns=columns, index=index, dtype=float)
-            self.rewards.iloc[0] = np.zeros(len(columns))
+            if rewards is None:
+                rewards = np.full((len(index), len(columns)), np.nan,
+                                  dtype=qtrader.framework.DTYPE)
+                rewards[0] = 0.0
+            self._rewards = rewards
+            # running wealth level
+            if wealth is None:
+                wealth = np.cumprod(rewards.sum(axis=1) + 1)
+            self._wealth = wealth
+            # forked record, sharing rows before `_split` with `_parent`
+            self._parent, self._split = None, 0
+
+        def fork(self, t: int, actions=None, rewards=None, wealth=None):
+            """Fork record after row `t`, into optional preallocated
+            buffers, sharing actions & rewards rows up to `t` and
+            copying only the rows after `t`. The (T,) wealth level,
+            read by `step` & `render`, is always copied whole."""
+            record = copy.copy(self)
+            record._actions = np.empty_like(self._actions) \
+                if actions is None else actions
+            record._rewards = np.empty_like(self._rewards) \
+                if rewards is None else rewards
+            record._wealth = np.empty_like(self._wealth) \
+                if wealth is None else wealth
+            record._actions[t + 1:] = self._actions[t + 1:]
+            record._rewards[t + 1:] = self._rewards[t + 1:]
+            record._wealth[:] = self._wealth
+            record._parent, record._split = self, t + 1
+            return record
+
+        def _materialize(self):
+            """Copy actions & rewards rows shared with the parent record."""
+            if self._parent is not None:
+                self._parent._materialize()
+                self._actions[:self._split] = \
+                    self._parent._actions[:self._split]
+                self._rewards[:self._split] = \
+                    self._parent._rewards[:self._split]
+                self._parent = None
+
+        @property
+        def actions(self) -> pd.DataFrame:
+            """Table of actions performed by agent."""
+            self._materialize()
+            return pd.DataFrame(self._actions,
+                                index=self.index, columns=self.columns)
+
+        @property
+        def rewards(self) -> pd.DataFrame:
+            """Table of rewards received by agent."""
+            self._materialize()
+            return pd.DataFrame(self._rewards,
+                                index=self.index, columns=self.columns)
+
+        @property
+        def pnl(self) -> pd.Series:
+            """Wealth level of agent."""
+            self._materialize()
+            return pd.Series(self._wealth, index=self.index)
 
     def __init__(self,
                  universe: typing.Optional[typing.List[str]] = None,
-                 prices: typing.Optional[pd.DataFrame] = None,
+                 prices: typing.Optional[typing.Union[pd.DataFrame,
+                                                      Descriptor]] = None,
                  trading_period: str = 'W-FRI',
                  cash: bool = True,
+                 window: typing.Optional[int] = None,
+                 repair: bool = False,
+                 reward: str = 'returns',
+                 ragged: bool = False,
                  **kwargs):
         # --------------------------------------------------------------------------
         # either `universe` or `prices` non-None
@@ -80,46 +307,94 @@ class BaseEnv(gym.Env):
         # --------------------------------------------------------------------------
         # set trading period
         self.trading_period = trading_period
+        # <prices> published by `share`, attached zero-copy
+        if isinstance(prices, Descriptor):
+            self._shared = SharedPanel.attach(prices)
+            self._prices = self._shared['prices']
+            self._returns = self._shared['returns']
         # <prices> provided
-        if prices is not None and isinstance(prices, pd.DataFrame):
-            # prices table
-            self._prices = qtrader.utils.pandas.clean(
-                prices.resample(self.trading_period).last())
+        elif prices is not None and isinstance(prices, pd.DataFrame):
+            # shared prices & relative (percentage) returns tables
+            self._prices, self._returns = qtrader.envs.cache.panels.get(
+                prices, self.trading_period, cash, ragged)
         # <universe> provided
         elif universe is not None and isinstance(universe, list):
-            # fetch prices
-            self._prices = qtrader.utils.pandas.clean(
+            # fetch prices, already resampled
+            self._prices, self._returns = qtrader.envs.cache.panels.build(
                 self._get_prices(universe,
-                                 trading_period=self.trading_period, **kwargs))
+                                 trading_period=self.trading_period, **kwargs),
+                None, cash, ragged)
         # --------------------------------------------------------------------------
-        # add cash column
-        if cash:
-            self._prices['CASH'] = 1.0
-        # relative (percentage) returns
-        self._returns = self._prices.pct_change()
+        # windowed observations lookback
+        if window is not None and window < 1:
+            raise ValueError('`window` should be a positive integer')
+        self.window = window
+        # contiguous buffers, indexed by `_counter`,
+        # zero-copy for C-ordered (e.g. cached or shared) tables
+        self._prices_buffer = np.ascontiguousarray(self._prices.values)
+        self._returns_buffer = np.ascontiguousarray(self._returns.values)
+        # read-only (window, M) views, indexed by `_counter - window + 1`
+        if window is not None:
+            rolling_view = qtrader.utils.preprocessor.rolling_view
+            self._prices_windows = rolling_view(self._prices_buffer, window)
+            self._returns_windows = rolling_view(self._returns_buffer, window)
+            # history before the first date: flat prices, unknown returns,
+            # first `window - 1` windows indexed by `_counter`
+            pad = window - 1
+            self._prices_head = rolling_view(
+                np.pad(self._prices_buffer[:pad],
+                       ((pad, 0), (0, 0)), mode='edge'), window)
+            self._returns_head = rolling_view(
+                np.pad(self._returns_buffer[:pad],
+                       ((pad, 0), (0, 0)), mode='constant',
+                       constant_values=np.nan), window)
+        # --------------------------------------------------------------------------
+        # validity bitmap of prices, assets listed at each date
+        # are available in the action space for the next period
+        self.ragged = ragged
+        if ragged:
+            self._listed, self.listings = qtrader.utils.pandas.availability(
+                self._prices)
+        else:
+            self._listed, self.listings = None, None
         # --------------------------------------------------------------------------
         # risky assets (& cash) under consideration
         num_instruments: int = len(self.universe)
         # risky assets & cash portfolio vector
         self.action_space = qtrader.envs.spaces.PortfolioVector(
             num_instruments)
-        # risky assets & cash prices vector
+        # invalid actions handling
+        self.repair = repair
+        # reward function
+        if reward not in ('returns', 'differential_sharpe_ratio'):
+            raise ValueError('unrecognised `reward`: %s' % reward)
+        self.reward = reward
+        # risky assets & cash prices vector, or window of vectors
+        if window is None:
+            ob_shape = (num_instruments,)
+        else:
+            ob_shape = (window, num_instruments)
         self.observation_space = gym.spaces.Box(-np.inf,
                                                 np.inf,
-                                                (num_instruments,),
-                                                dtype=np.float32)
+                                                ob_shape,
+                                                dtype=qtrader.framework.DTYPE)
         # --------------------------------------------------------------------------
         # counter to follow time index
         self._counter = 0
+        # episode bounds, `_stop` exclusive
+        self._start, self._stop = 0, len(self.dates)
+        # valid start offsets of episodes, at least one step long
+        self._starts = np.arange(len(self.dates) - 1)
+        self._mask_actions()
         # --------------------------------------------------------------------------
         # dictionary of registered agents
         self.agents = {}
-        # agent's initial wealth
-        self._pnl = pd.DataFrame(index=self.dates, columns=[
-                                 agent.name for agent in self.agents])
+        self._allocate()
         # --------------------------------------------------------------------------
         # figure & axes placeholders
         self._fig, self._axes = None, None
+        # cached line artists & background of render()
+        self._artists, self._background = None, None
 
     @property
     def universe(self):
@@ -136,10 +411,15 @@ class BaseEnv(gym.Env):
         """Current index."""
         return self.dates[self._counter]
 
+    @property
+    def episode(self) -> pd.DatetimeIndex:
+        """Dates of the current episode."""
+        return self.dates[self._start:self._stop]
+
     @property
     def _max_episode_steps(self) -> int:
         """Number of timesteps available."""
-        return len(self.dates)
+        return self._stop - self._start
 
     @abstractmethod
     def _get_prices(self, universe, trading_period, **kwargs) -> pd.DataFrame:
@@ -147,163 +427,498 @@ class BaseEnv(gym.Env):
 
     def _get_observation(self) -> object:
         ob = {}
-        ob['prices'] = self._prices.loc[self.index, :]
-        ob['returns'] = self._returns.loc[self.index, :]
+        if self.window is not None:
+            if self._counter < self.window - 1:
+                ob['prices'] = self._prices_head[self._counter]
+                ob['returns'] = self._returns_head[self._counter]
+            else:
+                t = self._counter - self.window + 1
+                ob['prices'] = self._prices_windows[t]
+                ob['returns'] = self._returns_windows[t]
+            return ob
+        ob['prices'] = pd.Series(self._prices_buffer[self._counter],
+                                 index=self._prices.columns, name=self.index)
+        ob['returns'] = pd.Series(self._returns_buffer[self._counter],
+                                  index=self._returns.columns, name=self.index)
         return ob
 
-    def _get_reward(self, action) -> pd.Series:
-        return self._returns.loc[self.index] * action
+    def _get_reward(self, action) -> np.ndarray:
+        return self._returns_buffer[self._counter] * action
 
     def _get_done(self) -> bool:
-        return self.index == self.dates[-1]
+        return self._counter == self._stop - 1
 
     def _get_info(self) -> dict:
-        return {}
-
-    def _validate_agents(self):
-        """Check agents' availability."""
-        if len(self.agents) == 0:
-            raise RuntimeError('no agent registed in the environment')
+        # running reward & risk statistics
+        return self._accumulators.info()
+
+    def _mask_actions(self):
+        """Mask assets not listed at the current date
+        out of the action space, for `ragged` environments."""
+        if self._listed is not None:
+            self.action_space.mask = self._listed[self._counter]
+
+    def _allocate(self):
+        """Allocate columnar (A, T, M) buffers of the
+        registered agents for the episode, with fresh records."""
+        names = list(self.agents)
+        shape = (len(names), self._stop - self._start, len(self.universe))
+        # initial portfolio vector & rewards
+        initial = self.Record(self.episode[:1], self.universe)
+        actions = np.full(shape, np.nan, dtype=initial._actions.dtype)
+        actions[:, 0] = initial._actions[0]
+        rewards = np.full(shape, np.nan, dtype=initial._rewards.dtype)
+        rewards[:, 0] = initial._rewards[0]
+        wealth = np.full(shape[:2], np.nan, dtype=initial._wealth.dtype)
+        wealth[:, 0] = initial._wealth[0]
+        self._buffers = (actions, rewards, wealth)
+        self._views()
+        # running reward & risk statistics
+        self._accumulators = Accumulators(len(names))
+        # dict-compatible views, per agent
+        self.agents = {name: self._record(a) for a, name in enumerate(names)}
+
+    def _views(self):
+        """Point the (A, T, M) tensors to the leading
+        rows of the buffers, one per registered agent."""
+        self._actions, self._rewards, self._wealth = (
+            buffer[:len(self.agents)] for buffer in self._buffers)
+
+    def _record(self, a: int) -> Record:
+        """Record of the agent at row `a` of the buffers."""
+        actions, rewards, wealth = (buffer[a] for buffer in self._buffers)
+        return self.Record(self.episode, self.universe,
+                           actions, rewards, wealth)
+
+    def _bind(self):
+        """Point the records of agents to their
+        rows of the buffers, after these have moved."""
+        for a, record in enumerate(self.agents.values()):
+            record._actions, record._rewards, record._wealth = (
+                buffer[a] for buffer in self._buffers)
+
+    def _move(self, capacity: int, rows: typing.Sequence[int]):
+        """Move the records at `rows` of the buffers, in order of the
+        registered agents, into fresh buffers with room for `capacity`
+        agents. The old buffers are left intact, for the parents of
+        forked records reading their shared rows on
+        `Record._materialize`."""
+        rows = np.asarray(rows, dtype=int)
+        buffers = []
+        for buffer in self._buffers:
+            _buffer = np.empty((capacity,) + buffer.shape[1:],
+                               dtype=buffer.dtype)
+            _buffer[:len(rows)] = buffer[rows]
+            buffers.append(_buffer)
+        self._buffers = tuple(buffers)
+        self._bind()
+
+    def _fork_records(self, source: 'BaseEnv'):
+        """Fork the columnar records of `source` at its current state."""
+        t = source._counter - source._start
+        self._buffers = (np.empty_like(source._actions),
+                         np.empty_like(source._rewards),
+                         np.empty_like(source._wealth))
+        self._accumulators = source._accumulators.take(
+            range(len(source.agents)), len(source.agents))
+        self.agents = {name: record.fork(t, *(buffer[a]
+                                              for buffer in self._buffers))
+                       for a, (name, record) in enumerate(
+                           source.agents.items())}
+        self._views()
+
+    def _add_agent(self, name: str):
+        """Add fresh records of agent `name` in the buffers."""
+        a = len(self.agents)
+        if a == len(self._buffers[0]):
+            # doubled when full, so that registering `A` agents
+            # copies O(A) records overall
+            self._move(max(2 * a, 1), range(a))
+        # initial portfolio vector & rewards
+        initial = self.Record(self.episode[:1], self.universe)
+        for buffer, row in zip(self._buffers, (initial._actions,
+                                               initial._rewards,
+                                               initial._wealth)):
+            buffer[a] = np.nan
+            buffer[a, 0] = row[0]
+        self.agents[name] = self._record(a)
+        self._views()
+
+    def _remove_agent(self, name: str):
+        """Remove records of agent `name` from the buffers."""
+        names = list(self.agents)
+        a = names.index(name)
+        del self.agents[name]
+        # records of the other agents, not shifted in place,
+        # since forked records may still share their rows
+        self._move(len(self._buffers[0]),
+                   [b for b in range(len(names)) if b != a])
+        self._views()
+
+    def _clear_agents(self):
+        """Clean records of all agents."""
+        self.agents = {}
+        self._allocate()
 
     #######
     # API
     #######
 
-    def register(self, agent: Agent):
-        """Register an `agent` to the environment."""
-        # verify interface
-        if not hasattr(agent, 'name'):
-            raise ValueError('agent must have a `name` attribute.')
-        # verify uniqueness
-        if agent.name not in self.agents:
-            self.agents[agent.name] = self.Record(
-                columns=self.universe, index=self.dates)
-
-    def unregister(self, agent: typing.Optional[Agent]):
-        """Unregister an `agent` from the environment."""
-        # when agent=None, unregister all agents
-        if agent is None:
-            # clean records
-            self.agents = {}
-            return None
-        # --------------------------------------------------------------------------
-        # verify interface
-        if not hasattr(agent, 'name'):
-            raise ValueError('agent must have a `name` attribute.')
-        # verify availability
-        if agent.name in self.agents:
-            del self.agents[agent.name]
-
-    def step(self, action: typing.Union[object, typing.Dict[str, object]]):
+    def step(self, action: typing.Union[np.ndarray, typing.Dict[str, object]]):
         """The agent takes a step in the environment.
 
         Parameters
         ----------
-        action: numpy.array | dict
-            Portfolio vector(s)
+        action: numpy.ndarray | dict
+            Portfolio vectors, per agent name, or (A, M) matrix
+            of portfolio vectors, in order of registration
 
         Returns
         -------
         observation, reward, episode_over, info: tuple
             * observation: object
                 Observation of the environment
-            * reward: float | dict
-                Reward(s) received after this step
+            * reward: dict | numpy.ndarray
+                Rewards received after this step, per agent
+                name, or (A,) vector for matrix `action`
             * done: bool
                 Flag for finished episode
             * info: dict
-                Information about this step
+                Running reward & risk statistics of agents,
+                see `qtrader.envs.accumulators.Accumulators`
         """
         self._validate_agents()
+        A = self._parse_actions(action)
         # timestep
         self._counter += 1
         # fetch return values
         observation = self._get_observation()
         done = self._get_done()
-        info = self._get_info()
-        # verify interface
-        if action.keys() != self.agents.keys():
-            raise ValueError(
-                'invalid interface of actions provided'
-            )
-        # container
-        reward = {}
-        # iterate over agents
-        for name, A in action.items():
-            # action validity check
-            if not self.action_space.contains(A):
-                raise ValueError(
-                    'invalid `action` attempted: %s' % (A)
-                )
-            # actions buffer
-            self.agents[name].actions.loc[self.index] = A
-            self.agents[name].rewards.loc[self.index] = self._get_reward(A)
-            # return value
-            reward[name] = self.agents[name].rewards.loc[self.index].sum()
+        # actions & rewards buffers
+        t = self._counter - self._start
+        self._actions[:, t] = A
+        self._rewards[:, t] = self._get_reward(A)
+        # return value
+        reward = self._rewards[:, t].sum(axis=1)
+        # running wealth level
+        self._wealth[:, t] = self._wealth[:, t - 1] * (1 + reward)
+        # running reward & risk statistics
+        self._accumulators.update(reward)
+        reward, info = self._format_step(action, reward, self._get_info())
+        # assets available for the next step
+        self._mask_actions()
         return observation, reward, done, info
 
-    def reset(self) -> object:
+    def evaluate(self,
+                 weights: typing.Union[np.ndarray, pd.DataFrame],
+                 names: typing.Optional[typing.List[str]] = None):
+        """Evaluate precomputed portfolio vectors over the whole episode,
+        in one vectorized pass, equivalent to step-by-step execution.
+
+        Parameters
+        ----------
+        weights: numpy.ndarray | pandas.DataFrame
+            (T, M) portfolio vectors aligned with `dates`,
+            or (K, T, M) tensor for `K` strategies; the first
+            row is ignored, since episodes start from cash;
+            tables are aligned by their dates & universe labels
+        names: list, optional
+            Strategies names, used as keys of the records
+
+        Returns
+        -------
+        records: dict
+            Actions and rewards `Record` per strategy
+        """
+        if isinstance(weights, pd.DataFrame):
+            # align labels, in any order
+            if set(weights.columns) != set(self.universe) or \
+                    len(weights.index) != len(self.dates) or \
+                    not self.dates.isin(weights.index).all():
+                raise ValueError(
+                    'labels of `weights` do not match dates & universe')
+            weights = weights.reindex(index=self.dates,
+                                      columns=self.universe)
+        # double precision, as actions of `step`
+        W = np.array(weights, dtype=float)
+        if W.ndim == 2:
+            W = W[np.newaxis]
+        if W.ndim != 3 or W.shape[1:] != self._prices_buffer.shape:
+            raise ValueError(
+                'invalid shape of `weights` attempted: %s' % (W.shape,))
+        K = W.shape[0]
+        if names is None:
+            names = ['strategy_%d' % k for k in range(K)]
+        if len(names) != K:
+            raise ValueError('one name per strategy is required')
+        # action validity check
+        valid = self._validate_actions(
+            W[:, 1:], None if self._listed is None else self._listed[:-1])
+        if not valid.all():
+            k, t = np.argwhere(~valid)[0]
+            raise ValueError(
+                'invalid `weights` attempted by %s at %s' %
+                (names[k], self.dates[t + 1]))
+        # initial portfolio vector
+        initial = self.Record(self.dates[:1], self.universe)
+        W[:, 0] = initial._actions[0]
+        # per-step, per-asset rewards, as `step`, stored as `DTYPE`
+        R = self._returns_buffer[np.newaxis] * W
+        R[:, 0] = initial._rewards[0]
+        W = W.astype(initial._actions.dtype, copy=False)
+        R = R.astype(initial._rewards.dtype, copy=False)
+        return {name: self.Record(self.dates, self.universe, W[k], R[k])
+                for k, name in enumerate(names)}
+
+    def reset(self,
+              start: typing.Optional[int] = None,
+              length: typing.Optional[int] = None) -> object:
         """Reset the state of the environment and returns an initial observation.
 
+        Episodes are views into the environment buffers, so that
+        resetting costs the same regardless of the history length.
+
+        Parameters
+        ----------
+        start: int, optional
+            Offset of the first date of the episode, drawn
+            uniformly from the valid offsets if `length` is given
+        length: int, optional
+            Number of dates of the episode, defaults to
+            the remaining history after `start`
+
         Returns
         -------
         observation: object
             The initial observation of the space.
         """
         self._validate_agents()
-        # set time to zero
-        self._counter = 0
+        # episode bounds
+        if length is not None and not 2 <= length <= len(self.dates):
+            raise ValueError('invalid episode `length`: %s' % length)
+        if start is None:
+            if length is None:
+                start = 0
+            else:
+                # valid start offsets for episodes of `length`
+                num_starts = np.searchsorted(self._starts,
+                                             len(self.dates) - length,
+                                             side='right')
+                start = self._starts[np.random.randint(num_starts)]
+        if length is None:
+            length = len(self.dates) - start
+        if not (0 <= start and length >= 2 and
+                start + length <= len(self.dates)):
+            raise ValueError('invalid episode `start`: %s' % start)
+        self._start, self._stop = int(start), int(start + length)
+        # fresh records for the episode
+        self._allocate()
+        # fresh artists of render() for the episode
+        self._artists = None
+        # set time to episode start
+        self._counter = self._start
+        self._mask_actions()
         # get initial observation
         ob = self._get_observation()
         return ob
 
-    def render(self) -> None:
-        """Graphical interface of environment."""
+    def share(self) -> SharedPanel:
+        """Publish prices & returns tables into shared memory, so that
+        environments of other processes constructed with
+        `prices=panel.descriptor` attach to them zero-copy.
+
+        Returns
+        -------
+        panel: qtrader.envs.shared.SharedPanel
+            Owner of the shared memory, responsible for `unlink`.
+        """
+        return SharedPanel.publish(prices=self._prices,
+                                   returns=self._returns)
+
+    def fork(self) -> 'BaseEnv':
+        """Branch off the current state of the environment.
+
+        The fork shares the immutable prices & returns buffers
+        and the agents' records up to the current date, copying
+        only the counter and the records from this point onward.
+
+        Returns
+        -------
+        env: BaseEnv
+            Environment at the current state, usable as `snapshot`.
+        """
+        env = copy.copy(self)
+        env._fork_records(self)
+        # action space mask is not shared
+        env.action_space = copy.copy(self.action_space)
+        # figure & axes are not shared
+        env._fig, env._axes = None, None
+        env._artists, env._background = None, None
+        return env
+
+    def restore(self, snapshot: 'BaseEnv'):
+        """Return to the state of a forked environment.
+
+        Parameters
+        ----------
+        snapshot: BaseEnv
+            Environment returned by `fork`, left reusable.
+        """
+        if snapshot._prices_buffer is not self._prices_buffer:
+            raise ValueError('`snapshot` is not a fork of the environment')
+        self._start, self._stop = snapshot._start, snapshot._stop
+        self._counter = snapshot._counter
+        self._fork_records(snapshot)
+        self._mask_actions()
+        # fresh artists of render() for the restored records
+        self._artists = None
+
+    def _render_artists(self, mode: str):
+        """Create line artists of `render` for the current episode."""
         # initialize figure and axes
         if self._fig is None or self._axes is None:
             # figure & axes for render()
             self._fig, self._axes = plt.subplots(ncols=2, figsize=(12.8, 4.8))
-        #
-        _pnl = pd.DataFrame(columns=self.agents.keys(),
-                            index=self.dates)
-        # calculate PnL
-        for agent in self.agents:
-            # collapse date-wise rewards
-            _pnl[agent] = (self.agents[agent].rewards.sum(
-                axis=1) + 1).cumprod()
         # remove everything from the axes
         self._axes[0].clear()
         self._axes[1].clear()
-        # axes content
-        self._prices.loc[:self.index].plot(ax=self._axes[0])
-        _pnl.loc[:self.index].plot(ax=self._axes[1])
+        # episode dates, as `matplotlib` numbers
+        x = matplotlib.dates.date2num(self.episode)
+        prices = self._prices_buffer[self._start:self._stop]
+        # axes content, drawn by blitting
+        self._artists = {
+            'x': x,
+            'prices': self._axes[0].plot(x[:1], prices[:1], animated=True),
+            'pnl': {agent: self._axes[1].plot(x[:1], [1.0], animated=True,
+                                              label=agent)[0]
+                    for agent in self.agents},
+            'key': (self._start, self._stop, tuple(self.agents)),
+            # last drawn timestep & number of frames written
+            'last': 0,
+            'frames': 0
+        }
         # axes settings
-        self._axes[0].set_xlim(self.dates.min(),
-                               self.dates.max())
+        self._axes[0].legend(self._artists['prices'], self.universe,
+                             loc='upper left')
+        self._axes[0].set_xlim(x[0], x[-1])
+        self._axes[0].set_ylim(np.nanmin(prices), np.nanmax(prices))
         self._axes[0].set_title('Market Prices')
         self._axes[0].set_ylabel('Prices')
-        self._axes[1].set_xlim(self._pnl.index.min(),
-                               self._pnl.index.max())
+        self._axes[0].xaxis_date()
+        self._axes[1].legend(loc='upper left')
+        self._axes[1].set_xlim(x[0], x[-1])
+        self._axes[1].set_ylim(0.95, 1.05)
         self._axes[1].set_title('PnL')
         self._axes[1].set_ylabel('Wealth Level')
-        # draw throttled
-        plt.pause(0.0001)
+        self._axes[1].xaxis_date()
+        # static content
+        self._render_background()
+        if mode == 'human':
+            plt.pause(0.0001)
+
+    def _render_background(self):
+        """Draw static content and cache it for blitting."""
         self._fig.canvas.draw()
+        self._background = self._fig.canvas.copy_from_bbox(self._fig.bbox)
+
+    def render(self,
+               mode: str = 'human',
+               refresh_rate: int = 1,
+               path: typing.Optional[str] = None
+               ) -> typing.Optional[np.ndarray]:
+        """Graphical interface of environment.
+
+        Line artists are created once per episode and updated in
+        place with the running prices and wealth levels, redrawing
+        only the lines unless the PnL axis has to be rescaled.
+
+        Parameters
+        ----------
+        mode: str, optional
+            'human' for a live figure, 'rgb_array' for returning frames
+        refresh_rate: int, optional
+            Redraw every `refresh_rate` steps
+        path: str, optional
+            File to write frames to, headless, with an optional
+            '%d' placeholder for the frame number
 
-    def summary(self) -> pd.DataFrame:
+        Returns
+        -------
+        frame: numpy.ndarray
+            (height, width, 3) RGB frame, when `mode` is 'rgb_array'
+        """
+        t = self._counter - self._start
+        # draw throttled
+        if t % refresh_rate != 0 and not self._get_done():
+            return None
+        # (re)build artists on new episode or agents
+        key = (self._start, self._stop, tuple(self.agents))
+        if self._fig is None or self._artists is None or \
+                self._artists['key'] != key:
+            self._render_artists(mode if path is None else None)
+        x = self._artists['x'][:t + 1]
+        # update artists in place
+        prices = self._prices_buffer[self._start:self._counter + 1]
+        for j, line in enumerate(self._artists['prices']):
+            line.set_data(x, prices[:, j])
+        low, high = self._axes[1].get_ylim()
+        rescale = False
+        for agent, line in self._artists['pnl'].items():
+            wealth = self.agents[agent]._wealth[:t + 1]
+            line.set_data(x, wealth)
+            # wealth levels since last frame
+            _wealth = wealth[self._artists['last']:]
+            if np.nanmin(_wealth) < low or np.nanmax(_wealth) > high:
+                low = min(low, np.nanmin(_wealth))
+                high = max(high, np.nanmax(_wealth))
+                rescale = True
+        self._artists['last'] = t
+        if rescale:
+            margin = 0.05 * (high - low)
+            self._axes[1].set_ylim(low - margin, high + margin)
+            self._render_background()
+        # blit lines on cached background
+        self._fig.canvas.restore_region(self._background)
+        for line in self._artists['prices']:
+            self._axes[0].draw_artist(line)
+        for line in self._artists['pnl'].values():
+            self._axes[1].draw_artist(line)
+        # headless: write frame to file
+        if path is not None:
+            frame = self._artists['frames']
+            self._fig.savefig(path % frame if '%' in path else path)
+            self._artists['frames'] += 1
+        elif mode == 'human':
+            self._fig.canvas.blit(self._fig.bbox)
+            self._fig.canvas.flush_events()
+        if mode == 'rgb_array':
+            return np.array(self._fig.canvas.buffer_rgba())[:, :, :3]
+        return None
+
+    def summary(self,
+                records: typing.Optional[typing.Dict[str, Record]] = None
+                ) -> pd.DataFrame:
         """Generate statistics summary and figures.
 
+        Parameters
+        ----------
+        records: dict, optional
+            Records to summarise, e.g. output of `evaluate`,
+            defaults to the registered agents' records
+
         Returns
         -------
         table: pd.DataFrame
             Strategy report.
         """
+        if records is None:
+            records = self.agents
         summary = {}
-        for agent in self.agents:
+        for agent in records:
             prices = self._prices
-            returns = self.agents[agent].rewards.sum(axis=1)
+            returns = records[agent].rewards.sum(axis=1)
             returns.name = agent
-            weights = self.agents[agent].actions
+            weights = records[agent].actions
             # set name for figures
             weights.name = agent
             # statistics summary
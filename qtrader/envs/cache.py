@@ -0,0 +1,135 @@
+import hashlib
+import threading
+import collections
+import typing
+
+import numpy as np
+import pandas as pd
+
+import qtrader
+
+
+class PanelCache:
+    """Process-wide cache of resampled prices & returns panels,
+    keyed by content hash of the raw prices, trading period, options
+    and `qtrader.framework.DTYPE`, with least-recently-used eviction.
+
+    Cached panels are shared among environments and should be
+    treated as read-only.
+
+    Attributes
+    ----------
+    maxsize: int
+        Maximum number of cached panels
+    hits: int
+        Number of cache hits
+    misses: int
+        Number of cache misses
+    """
+
+    def __init__(self, maxsize: int = 32):
+        """Constructs a `PanelCache` object.
+
+        Parameters
+        ----------
+        maxsize: int, optional
+            Maximum number of cached panels
+        """
+        self.maxsize = maxsize
+        self.hits, self.misses = 0, 0
+        self._panels = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._panels)
+
+    @staticmethod
+    def digest(prices: pd.DataFrame) -> str:
+        """Content hash of `prices` values, index & columns."""
+        _hash = hashlib.sha1()
+        _hash.update(pd.util.hash_pandas_object(prices, index=True).values)
+        _hash.update(repr(prices.columns.tolist()).encode())
+        return _hash.hexdigest()
+
+    @staticmethod
+    def build(prices: pd.DataFrame,
+              trading_period: typing.Optional[str],
+              cash: bool = True,
+              ragged: bool = False) -> typing.Tuple[pd.DataFrame,
+                                                    pd.DataFrame]:
+        """Resampled (unless `trading_period` is `None`) & cleaned
+        prices, with optional cash, and returns, of
+        `qtrader.framework.DTYPE` precision.
+
+        Ragged prices keep dates with any asset listed, with missing
+        prices outside listing intervals, while returns of assets not
+        listed over a period are zero, so that rewards are dense."""
+        if trading_period is not None:
+            prices = prices.resample(trading_period).last()
+        _prices = qtrader.utils.pandas.clean(
+            prices, how='all' if ragged else 'any')
+        if cash:
+            _prices['CASH'] = 1.0
+        _prices = _prices.astype(qtrader.framework.DTYPE)
+        _returns = _prices.pct_change(fill_method=None)
+        if ragged:
+            _returns = _returns.fillna(0.0)
+            _returns.iloc[0] = np.nan
+        # C-ordered values, for zero-copy row-major buffers
+        return tuple(pd.DataFrame(np.ascontiguousarray(df.values),
+                                  index=df.index, columns=df.columns,
+                                  copy=False)
+                     for df in (_prices, _returns))
+
+    def get(self,
+            prices: pd.DataFrame,
+            trading_period: str,
+            cash: bool = True,
+            ragged: bool = False) -> typing.Tuple[pd.DataFrame,
+                                                  pd.DataFrame]:
+        """Get (prices, returns) panels of raw `prices` resampled
+        at `trading_period`, building them on cache miss.
+
+        Parameters
+        ----------
+        prices: pandas.DataFrame
+            Raw prices table
+        trading_period: str
+            Trading period offset alias
+        cash: bool, optional
+            Add cash column
+        ragged: bool, optional
+            Keep assets' missing prices, see `build`
+
+        Returns
+        -------
+        prices, returns: tuple
+            * prices: pandas.DataFrame
+                Resampled prices
+            * returns: pandas.DataFrame
+                Relative (percentage) returns
+        """
+        key = (self.digest(prices), trading_period, cash, ragged,
+               qtrader.framework.DTYPE)
+        with self._lock:
+            if key in self._panels:
+                self._panels.move_to_end(key)
+                self.hits += 1
+                return self._panels[key]
+        panel = self.build(prices, trading_period, cash, ragged)
+        with self._lock:
+            self.misses += 1
+            self._panels[key] = panel
+            while len(self._panels) > self.maxsize:
+                self._panels.popitem(last=False)
+        return panel
+
+    def clear(self):
+        """Discard cached panels and statistics."""
+        with self._lock:
+            self._panels.clear()
+            self.hits, self.misses = 0, 0
+
+
+# process-wide cache, used by `qtrader.envs.BaseEnv`
+panels = PanelCache()
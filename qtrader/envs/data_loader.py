@@ -1,81 +1,397 @@
-# library logger
+# library logger & flags
 from qtrader.framework.logger import logger
+import qtrader.framework
 # library VAR simulator
 from qtrader.simulation import VAR as _VAR
 # library pandas cleaner
 from qtrader.utils.pandas import clean
+# shared memory panels
+from qtrader.envs.shared import Descriptor, SharedPanel
 
 # scientific computing
 import numpy as np
 import pandas as pd
 
 import os
+import time
+import pickle
 import typing
+import tempfile
+import threading
+import concurrent.futures
+
+from abc import abstractmethod
 
 # market data provider
 import quandl
+import quandl.errors.quandl_error
+import requests
 quandl.ApiConfig.api_key = os.environ.get('QUANDL_API_KEY')
 
 
-class Finance:
-    """Market Data Wrapper."""
+class Provider:
+    """Market Data Provider Interface.
+
+    Attributes
+    ----------
+    transient: tuple
+        Exception types of failures worth retrying, e.g. connection
+        errors, others such as unknown tickers are permanent
+    """
+
+    transient = (ConnectionError, TimeoutError)
+
+    @abstractmethod
+    def get(self,
+            ticker: str,
+            start_date: str = None,
+            end_date: str = None) -> pd.Series:
+        """Fetch prices for `ticker`, raising on failure.
+
+        Parameters
+        ----------
+        ticker: str
+            Ticker name.
+        start_date: str, optional
+            Start date in format 'YYYY-MM-DD'.
+        end_date: str, optional
+            End date in format 'YYYY-MM-DD'.
+
+        Returns
+        -------
+        series: pandas.Series
+            Adjusted Close prices for `ticker`.
+        """
+        raise NotImplementedError
+
+
+class QuandlProvider(Provider):
+    """Quandl WIKI Prices Provider."""
 
     _col = 'Adj. Close'
 
+    transient = Provider.transient + (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        quandl.errors.quandl_error.LimitExceededError,
+        quandl.errors.quandl_error.InternalServerError,
+        quandl.errors.quandl_error.ServiceUnavailableError)
+
+    def get(self, ticker, start_date=None, end_date=None):
+        df = quandl.get('WIKI/%s' % ticker,
+                        start_date=start_date, end_date=end_date)
+        return df[self._col]
+
+
+class LocalProvider(Provider):
+    """File-backed Provider, serving `<root>/<ticker>.csv`
+    files of dates and prices, for offline use."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def get(self, ticker, start_date=None, end_date=None):
+        df = pd.read_csv(os.path.join(self.root, '%s.csv' % ticker),
+                         index_col=0, parse_dates=True)
+        return df.iloc[:, 0].sort_index().loc[start_date:end_date]
+
+
+class CachedProvider(Provider):
+    """Provider with incremental on-disk cache, storing per-ticker
+    prices along with the date range held, so that only missing
+    date ranges are fetched from the underlying `provider`.
+
+    Attributes
+    ----------
+    stats: dict
+        Number of cache 'hits', 'partial' hits and 'misses'
+    """
+
+    def __init__(self, provider: Provider, root: str):
+        """Constructs a `CachedProvider` object.
+
+        Parameters
+        ----------
+        provider: Provider
+            Underlying market data provider.
+        root: str
+            Path of cache directory.
+        """
+        self.provider = provider
+        self.root = root
+        if not os.path.exists(root):
+            os.makedirs(root, exist_ok=True)
+        self.stats = {'hits': 0, 'partial': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def transient(self) -> tuple:
+        """Transient failures of the underlying `provider`."""
+        return self.provider.transient
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, '%s.pkl' % ticker)
+
+    def _read(self, ticker: str) -> typing.Optional[dict]:
+        try:
+            with open(self._path(ticker), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, ticker: str, entry: dict):
+        """Atomic write, readers never see partial entries."""
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(tmp, self._path(ticker))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    @staticmethod
+    def _date(timestamp: pd.Timestamp) -> typing.Optional[str]:
+        """Open-ended dates as `None`, otherwise 'YYYY-MM-DD'."""
+        if timestamp == pd.Timestamp.min:
+            return None
+        return timestamp.strftime('%Y-%m-%d')
+
+    def get(self, ticker, start_date=None, end_date=None):
+        start = pd.Timestamp.min if start_date is None \
+            else pd.Timestamp(start_date)
+        end = pd.Timestamp.today().normalize() if end_date is None \
+            else pd.Timestamp(end_date)
+        entry = self._read(ticker)
+        # missing date ranges
+        if entry is None:
+            series, missing = None, [(start, end)]
+        else:
+            series, missing = entry['series'], []
+            if start < entry['start']:
+                missing.append((start, entry['start'] - pd.Timedelta(days=1)))
+            if end > entry['end']:
+                missing.append((entry['end'] + pd.Timedelta(days=1), end))
+            start, end = min(start, entry['start']), max(end, entry['end'])
+        # fetch & merge
+        for _start, _end in missing:
+            fetched = self.provider.get(ticker,
+                                        self._date(_start), self._date(_end))
+            series = fetched if series is None \
+                else series.combine_first(fetched)
+        if len(missing) > 0:
+            self._write(ticker, {'series': series, 'start': start, 'end': end})
+        with self._lock:
+            if entry is None:
+                self.stats['misses'] += 1
+            elif len(missing) > 0:
+                self.stats['partial'] += 1
+            else:
+                self.stats['hits'] += 1
+        return series.loc[start_date:end_date]
+
+
+class Finance:
+    """Market Data Wrapper."""
+
     @classmethod
     def _get(cls,
+             provider: Provider,
              ticker: str,
-             **kwargs) -> typing.Optional[pd.DataFrame]:
-        """Helper method for `quandl.get`.
+             retries: int = 3,
+             backoff: float = 1.0,
+             **kwargs) -> pd.Series:
+        """Helper method for `provider.get`, with retries
+        of `provider.transient` failures only.
 
         Parameters
         ----------
+        provider: Provider
+            Market data provider.
         ticker: str
             Ticker name.
+        retries: int, optional
+            Number of retries after a failed request.
+        backoff: float, optional
+            Initial delay between retries in seconds, doubled per retry.
         **kwargs: dict
-            Arguments for `quandl.get`.
+            Arguments for `provider.get`.
 
         Returns
         -------
-        df: pandas.DataFrame
+        series: pandas.Series
             Market data for `ticker`.
         """
-        try:
-            return quandl.get('WIKI/%s' % ticker, **kwargs)
-        except:
-            logger.warn('failed to fetch market data for %s' % ticker)
-            return None
+        for attempt in range(retries + 1):
+            try:
+                return provider.get(ticker, **kwargs)
+            except provider.transient as e:
+                if attempt == retries:
+                    raise
+                logger.info('retrying %s after failure: %s' % (ticker, e))
+                time.sleep(backoff * 2 ** attempt)
+
+    @classmethod
+    def _fetch(cls,
+               tickers: typing.List[str],
+               provider: Provider = None,
+               max_workers: int = 8,
+               retries: int = 3,
+               backoff: float = 1.0,
+               **kwargs) -> typing.Tuple[dict, dict]:
+        """Helper method for concurrent `_get` of `tickers`,
+        on a bounded thread pool.
+
+        Returns
+        -------
+        data: dict
+            Market data per fetched ticker.
+        failures: dict
+            Error message per failed ticker.
+        """
+        if provider is None:
+            provider = QuandlProvider()
+        data, failures = {}, {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            futures = [pool.submit(cls._get, provider, ticker,
+                                   retries, backoff, **kwargs)
+                       for ticker in tickers]
+            for ticker, future in zip(tickers, futures):
+                try:
+                    data[ticker] = future.result()
+                except Exception as e:
+                    failures[ticker] = repr(e)
+        if len(failures) > 0:
+            logger.warning('failed to fetch market data for %s' %
+                           ', '.join(failures))
+        return data, failures
 
     @classmethod
     def _csv(cls,
              root: str,
-             tickers: typing.Union[str, typing.List[str]]):
-        """Helper method for loading prices from CSV files.
+             tickers: typing.Union[str, typing.List[str]],
+             start_date: str = None,
+             end_date: str = None,
+             chunksize: int = None):
+        """Helper method for loading prices from CSV files,
+        parsing only the dates and `tickers` columns.
 
         Parameters
         ----------
         root: str
             Path of CSV file.
-        ticker: str
-            Ticker name.
+        tickers: list
+            List of ticker names.
+        start_date: str, optional
+            Start date in format 'YYYY-MM-DD'.
+        end_date: str, optional
+            End date in format 'YYYY-MM-DD'.
+        chunksize: int, optional
+            Number of rows parsed at once, filtering dates per chunk.
 
         Returns
         -------
-        cache: pandas.Series | pandas.DataFrame
+        cache: pandas.DataFrame
             Cached data from CSV.
         """
-        df = pd.read_csv(root, index_col='Date',
-                         parse_dates=True).sort_index(ascending=True)
-        union = [ticker for ticker in tickers if ticker in df.columns]
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        # header only, first column of dates
+        header = pd.read_csv(root, nrows=0).columns
+        index, columns = header[0], set(header[1:])
+        union = [ticker for ticker in tickers if ticker in columns]
+        # column projection, typed parsing
+        kwargs = dict(index_col=index,
+                      usecols=[index] + union,
+                      dtype={ticker: qtrader.framework.DTYPE
+                             for ticker in union},
+                      parse_dates=[index])
+        if chunksize is None:
+            df = pd.read_csv(root, **kwargs)
+        else:
+            df = pd.concat(chunk.sort_index(ascending=True)
+                           .loc[start_date:end_date]
+                           for chunk in pd.read_csv(root, chunksize=chunksize,
+                                                    **kwargs))
+        df = df.sort_index(ascending=True).loc[start_date:end_date]
         return df[union]
 
+    @classmethod
+    def _store(cls,
+               root: str,
+               tickers: typing.Union[str, typing.List[str]],
+               start_date: str = None,
+               end_date: str = None):
+        """Helper method for loading prices from binary store,
+        memory-mapped, without parsing.
+
+        Parameters
+        ----------
+        root: str
+            Path of store directory.
+        tickers: list
+            List of ticker names.
+        start_date: str, optional
+            Start date in format 'YYYY-MM-DD'.
+        end_date: str, optional
+            End date in format 'YYYY-MM-DD'.
+
+        Returns
+        -------
+        df: pandas.DataFrame
+            Table of prices for `tickers` found in store.
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        # (N, T) ticker-major values, memory-mapped
+        values = np.load(os.path.join(root, 'values.npy'), mmap_mode='r')
+        dates = pd.DatetimeIndex(np.load(os.path.join(root, 'dates.npy')))
+        # sorted ticker names
+        columns = np.load(os.path.join(root, 'tickers.npy'))
+        # binary search of tickers
+        rows = np.searchsorted(columns, tickers).clip(0, len(columns) - 1)
+        found = columns[rows] == np.array(tickers, dtype=str)
+        union = [ticker for ticker, f in zip(tickers, found) if f]
+        rows = rows[found]
+        # binary search of dates range
+        period = dates.slice_indexer(start_date, end_date)
+        values = values[rows, period].T.astype(qtrader.framework.DTYPE,
+                                                copy=False)
+        return pd.DataFrame(values, index=dates[period], columns=union)
+
+    @classmethod
+    def to_store(cls, df: pd.DataFrame, root: str):
+        """Write table of prices to binary store, see `_store`.
+
+        Parameters
+        ----------
+        df: pandas.DataFrame
+            Table of prices, indexed by dates.
+        root: str
+            Path of store directory.
+        """
+        if not os.path.exists(root):
+            os.makedirs(root)
+        df = df.sort_index(ascending=True)
+        columns = sorted(df.columns)
+        np.save(os.path.join(root, 'values.npy'),
+                np.ascontiguousarray(df[columns].values.T,
+                                     dtype=qtrader.framework.DTYPE))
+        np.save(os.path.join(root, 'dates.npy'),
+                df.index.values.astype('datetime64[ns]'))
+        np.save(os.path.join(root, 'tickers.npy'),
+                np.array(columns, dtype=str))
+
     @classmethod
     def Returns(cls,
                 tickers: typing.List[str],
                 start_date: str = None,
                 end_date: str = None,
                 freq: str = 'B',
-                csv: str = None):
+                csv: str = None,
+                chunksize: int = None,
+                store: str = None,
+                shared: Descriptor = None):
         """Get returns for `tickers`.
 
         Parameters
@@ -90,14 +406,25 @@ class Finance:
             Resampling frequency.
         csv: str, optional
             CSV file path.
+        chunksize: int, optional
+            Number of CSV rows parsed at once.
+        store: str, optional
+            Binary store directory path, see `to_store`.
+        shared: qtrader.envs.shared.Descriptor, optional
+            Shared memory panel with 'returns' table, attached zero-copy.
 
         Returns
         -------
         df: pandas.DataFrame
             Table of Returns of Adjusted Close prices for `tickers`.
         """
+        if isinstance(shared, Descriptor):
+            return SharedPanel.attach(shared).select(
+                'returns', tickers, start_date, end_date)
+        if isinstance(store, str):
+            return cls._store(store, tickers, start_date, end_date)
         if isinstance(csv, str):
-            return cls._csv(csv, tickers).loc[start_date:end_date]
+            return cls._csv(csv, tickers, start_date, end_date, chunksize)
         else:
             return cls.Prices(tickers,
                               start_date,
@@ -110,7 +437,16 @@ class Finance:
                start_date: str = None,
                end_date: str = None,
                freq: str = 'B',
-               csv: str = None):
+               csv: str = None,
+               chunksize: int = None,
+               store: str = None,
+               shared: Descriptor = None,
+               provider: Provider = None,
+               max_workers: int = 8,
+               retries: int = 3,
+               backoff: float = 1.0,
+               cache: str = None,
+               return_failures: bool = False):
         """Get prices for `tickers`.
 
         Parameters
@@ -125,26 +461,161 @@ class Finance:
             Resampling frequency.
         csv: str, optional
             CSV file path.
+        chunksize: int, optional
+            Number of CSV rows parsed at once.
+        store: str, optional
+            Binary store directory path, see `to_store`.
+        shared: qtrader.envs.shared.Descriptor, optional
+            Shared memory panel with 'prices' table, attached zero-copy.
+        provider: Provider, optional
+            Market data provider, defaults to `QuandlProvider`.
+        max_workers: int, optional
+            Number of concurrent requests.
+        retries: int, optional
+            Number of retries after a failed request.
+        backoff: float, optional
+            Initial delay between retries in seconds, doubled per retry.
+        cache: str, optional
+            Cache directory path, see `CachedProvider`.
+        return_failures: bool, optional
+            Return dictionary of error messages of failed tickers.
 
         Returns
         -------
         df: pandas.DataFrame | pandas.Series
             Table of Adjusted Close prices for `tickers`.
+        failures: dict
+            Error message per failed ticker.
         """
+        if isinstance(shared, Descriptor):
+            return SharedPanel.attach(shared).select(
+                'prices', tickers, start_date, end_date)
+        if isinstance(store, str):
+            return cls._store(store, tickers, start_date, end_date)
         if isinstance(csv, str):
-            return cls._csv(csv, tickers).loc[start_date:end_date]
+            return cls._csv(csv, tickers, start_date, end_date, chunksize)
         else:
-            # tmp dictionary of panda.Series
-            data = {}
-            for i, ticker in enumerate(tickers):
-                tmp_df = cls._get(
-                    ticker, start_date=start_date, end_date=end_date)
-                # successful data fetchinf
-                if tmp_df is not None:
-                    data[ticker] = tmp_df[cls._col]
+            # incremental on-disk cache
+            if isinstance(cache, str):
+                provider = CachedProvider(provider or QuandlProvider(), cache)
+            # dictionary of panda.Series, fetched concurrently
+            data, failures = cls._fetch(tickers, provider, max_workers,
+                                        retries, backoff,
+                                        start_date=start_date,
+                                        end_date=end_date)
             # dict to pandas.DataFrame
-            df = pd.DataFrame(data)
-        return df.sort_index(ascending=True).resample(freq).last()
+            df = pd.DataFrame(data).astype(qtrader.framework.DTYPE)
+        df = df.sort_index(ascending=True).resample(freq).last()
+        if return_failures:
+            return df, failures
+        return df
+
+    @classmethod
+    def build(cls,
+              root: str,
+              tickers: typing.List[str] = None,
+              start_date: str = None,
+              end_date: str = None,
+              freq: str = 'B',
+              provider: Provider = None,
+              batch_size: int = 50,
+              max_workers: int = 8,
+              retries: int = 3,
+              backoff: float = 1.0) -> dict:
+        """Build universe database under `root`, resumable.
+
+        Prices are fetched concurrently in batches, each ticker
+        checkpointed on arrival in `<root>/cache` (see `CachedProvider`),
+        so that a rerun only fetches tickers missing after a failure.
+        Prices and returns are written both as CSV and binary stores.
+
+        Layout
+        ------
+        <root>/sp500.csv
+            Constituents, when `tickers` not provided.
+        <root>/cache/<ticker>.pkl
+            Per-ticker checkpoints.
+        <root>/prices.csv, <root>/returns.csv
+            Tables of prices & returns.
+        <root>/prices, <root>/returns
+            Binary stores, see `to_store`.
+
+        Parameters
+        ----------
+        root: str
+            Path of database directory.
+        tickers: list, optional
+            List of ticker names, defaults to S&P 500 constituents.
+        start_date: str, optional
+            Start date in format 'YYYY-MM-DD'.
+        end_date: str, optional
+            End date in format 'YYYY-MM-DD'.
+        freq: str, optional
+            Resampling frequency.
+        provider: Provider, optional
+            Market data provider, defaults to `QuandlProvider`.
+        batch_size: int, optional
+            Number of tickers per batch.
+        max_workers: int, optional
+            Number of concurrent requests.
+        retries: int, optional
+            Number of retries after a failed request.
+        backoff: float, optional
+            Initial delay between retries in seconds, doubled per retry.
+
+        Returns
+        -------
+        report: dict
+            Number of 'tickers', 'fetched' from provider and 'resumed'
+            from checkpoints, 'failures' per ticker, elapsed 'seconds'
+            and 'throughput' in tickers per second.
+        """
+        if not os.path.exists(root):
+            os.makedirs(root)
+        # universe
+        if tickers is None:
+            path = os.path.join(root, 'sp500.csv')
+            if os.path.exists(path):
+                sp500 = pd.read_csv(path, index_col=0, header=0)
+            else:
+                sp500 = cls.SP500()
+                sp500.to_csv(path)
+            tickers = sp500.index.tolist()
+        # per-ticker checkpoints
+        provider = CachedProvider(provider or QuandlProvider(),
+                                  os.path.join(root, 'cache'))
+        data, failures = {}, {}
+        start = time.time()
+        for i in range(0, len(tickers), batch_size):
+            batch, _failures = cls._fetch(tickers[i:i + batch_size],
+                                          provider, max_workers,
+                                          retries, backoff,
+                                          start_date=start_date,
+                                          end_date=end_date)
+            data.update(batch)
+            failures.update(_failures)
+            elapsed = time.time() - start
+            logger.info('fetched %d/%d tickers, %.1f tickers/sec' %
+                        (min(i + batch_size, len(tickers)), len(tickers),
+                         min(i + batch_size, len(tickers)) /
+                         max(elapsed, 1e-9)))
+        # tables
+        prices = pd.DataFrame(data).astype(qtrader.framework.DTYPE)
+        prices = prices.sort_index(ascending=True).resample(freq).last()
+        returns = prices.pct_change()[1:]
+        for name, df in (('prices', prices), ('returns', returns)):
+            df.to_csv(os.path.join(root, '%s.csv' % name),
+                      index_label='Date')
+            cls.to_store(df, os.path.join(root, name))
+        elapsed = time.time() - start
+        return {
+            'tickers': len(tickers),
+            'fetched': provider.stats['misses'] + provider.stats['partial'],
+            'resumed': provider.stats['hits'],
+            'failures': failures,
+            'seconds': elapsed,
+            'throughput': len(tickers) / max(elapsed, 1e-9)
+        }
 
     @classmethod
     def SP500(cls, return_prices_returns: bool = False, **kwargs):
@@ -0,0 +1,157 @@
+import collections
+import typing
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# picklable handle of a `SharedPanel`, passed to child processes
+Descriptor = collections.namedtuple(
+    'Descriptor', ['name', 'keys', 'shape', 'dtype', 'columns'])
+
+# attached panels of the process, by shared memory block name
+_attached = {}
+
+
+class SharedPanel:
+    """Tables of the same (T, M) shape, index and columns, e.g. prices
+    and returns, published once into `multiprocessing.shared_memory`
+    and attached zero-copy by other processes using the `descriptor`.
+
+    The block holds the (K, T, M) values followed by the (T,) dates,
+    tables are read-only `pandas.DataFrame` views into the block.
+
+    Attributes
+    ----------
+    descriptor: Descriptor
+        Picklable handle of the panel
+    index: pandas.DatetimeIndex
+        Dates of the tables
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory,
+                 descriptor: Descriptor, owner: bool = False):
+        self._shm = shm
+        self.descriptor = descriptor
+        self.owner = owner
+        K, T, M = descriptor.shape
+        self._values = np.ndarray((K, T, M), dtype=descriptor.dtype,
+                                  buffer=shm.buf)
+        self._dates = np.ndarray((T,), dtype='M8[ns]', buffer=shm.buf,
+                                 offset=self._values.nbytes)
+        if not owner:
+            self._values.flags.writeable = False
+        self.index = pd.DatetimeIndex(self._dates.copy())
+
+    @classmethod
+    def publish(cls, **tables: pd.DataFrame) -> 'SharedPanel':
+        """Copy `tables`, sharing index & columns, into a new
+        shared memory block.
+
+        Parameters
+        ----------
+        tables: pandas.DataFrame
+            Tables per key, e.g. `prices=..., returns=...`
+
+        Returns
+        -------
+        panel: SharedPanel
+            Owner of the block, responsible for `unlink`.
+        """
+        if len(tables) == 0:
+            raise ValueError('at least one table is required')
+        keys = tuple(tables)
+        first = tables[keys[0]]
+        for key in keys[1:]:
+            if not (tables[key].index.equals(first.index) and
+                    tables[key].columns.equals(first.columns)):
+                raise ValueError('tables must share index & columns')
+        values = np.stack([tables[key].values for key in keys])
+        descriptor = Descriptor(None, keys, values.shape,
+                                values.dtype.str, first.columns.tolist())
+        shm = shared_memory.SharedMemory(
+            create=True, size=max(values.nbytes + 8 * values.shape[1], 1))
+        descriptor = descriptor._replace(name=shm.name)
+        panel = cls(shm, descriptor, owner=True)
+        panel._values[:] = values
+        panel._dates[:] = first.index.values.astype('M8[ns]')
+        panel.index = pd.DatetimeIndex(panel._dates.copy())
+        _attached[shm.name] = panel
+        return panel
+
+    @classmethod
+    def attach(cls, descriptor: Descriptor) -> 'SharedPanel':
+        """Attach to a published panel, once per process.
+
+        Parameters
+        ----------
+        descriptor: Descriptor
+            Handle of the panel, see `publish`.
+
+        Returns
+        -------
+        panel: SharedPanel
+            Read-only panel.
+        """
+        if descriptor.name not in _attached:
+            shm = shared_memory.SharedMemory(name=descriptor.name)
+            _attached[descriptor.name] = cls(shm, descriptor)
+        return _attached[descriptor.name]
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        """Zero-copy table of `key`."""
+        return pd.DataFrame(self._values[self.descriptor.keys.index(key)],
+                            index=self.index,
+                            columns=self.descriptor.columns,
+                            copy=False)
+
+    def select(self,
+               key: str,
+               columns: typing.List[str],
+               start_date: str = None,
+               end_date: str = None) -> pd.DataFrame:
+        """Table of `key` for `columns` found and dates range,
+        zero-copy when `columns` are adjacent in the panel.
+
+        Parameters
+        ----------
+        key: str
+            Table key.
+        columns: list
+            Column names.
+        start_date: str, optional
+            Start date in format 'YYYY-MM-DD'.
+        end_date: str, optional
+            End date in format 'YYYY-MM-DD'.
+
+        Returns
+        -------
+        df: pandas.DataFrame
+            Table of `key`.
+        """
+        union = [column for column in columns
+                 if column in self.descriptor.columns]
+        positions = [self.descriptor.columns.index(column)
+                     for column in union]
+        period = self.index.slice_indexer(start_date, end_date)
+        values = self._values[self.descriptor.keys.index(key), period]
+        if len(union) > 0 and \
+                positions == list(range(positions[0], positions[-1] + 1)):
+            # adjacent columns, basic slicing view
+            values = values[:, positions[0]:positions[-1] + 1]
+        else:
+            values = values[:, positions]
+        return pd.DataFrame(values, index=self.index[period],
+                            columns=union, copy=False)
+
+    def close(self):
+        """Detach from the block, once tables are released."""
+        _attached.pop(self.descriptor.name, None)
+        self._values = self._dates = None
+        self._shm.close()
+
+    def unlink(self):
+        """Detach from and free the block, by its owner."""
+        self.close()
+        self._shm.unlink()
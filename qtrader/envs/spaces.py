@@ -2,24 +2,38 @@ import numpy as np
 
 import gym
 
+from qtrader.utils.numpy import simplex_projection
+
 
 class PortfolioVector(gym.Space):
     """OpenAI Gym Spaces Portfolio Vector Data Structure."""
 
-    def __init__(self, num_instruments):
+    def __init__(self, num_instruments, long_only=False, mask=None):
         """Constructs a `PortfolioVector` object.
 
         Parameters
         ----------
         num_instruments: int
             Cardinality of universe
+        long_only: bool, optional
+            Non-negative portfolio weights
+        mask: numpy.ndarray, optional
+            (M,) boolean mask of available instruments, the
+            weights of unavailable ones are constrained to zero
         """
-        self.low = -np.ones(num_instruments, dtype=float) * np.inf
+        self.long_only = long_only
+        self.mask = mask
+        if long_only:
+            self.low = np.zeros(num_instruments, dtype=float)
+        else:
+            self.low = -np.ones(num_instruments, dtype=float) * np.inf
         self.high = np.ones(num_instruments, dtype=float) * np.inf
 
     def sample(self):
         """Draw random `PortfolioVector` sample."""
         _vec = np.random.uniform(0, 1.0, self.shape[0])
+        if self.mask is not None:
+            _vec[~self.mask] = 0.0
         return _vec / np.sum(_vec)
 
     def contains(self, x, tolerance=1e-5):
@@ -27,7 +41,44 @@ class PortfolioVector(gym.Space):
         shape_predicate = x.shape == self.shape
         range_predicate = (x >= self.low).all() and (x <= self.high).all()
         budget_constraint = np.abs(x.sum() - 1.0) < tolerance
-        return shape_predicate and range_predicate and budget_constraint
+        mask_predicate = self.mask is None or not np.any(x[~self.mask])
+        return shape_predicate and range_predicate and \
+            budget_constraint and mask_predicate
+
+    def contains_many(self, X, tolerance=1e-5, mask=None):
+        """Assert if each of the (..., M) vectors `X` in space.
+
+        Parameters
+        ----------
+        X: numpy.ndarray
+            (..., M) vectors
+        tolerance: float, optional
+            Budget constraint tolerance
+        mask: numpy.ndarray, optional
+            (..., M) boolean masks of available instruments,
+            defaults to `mask` of the space
+
+        Returns
+        -------
+        mask: numpy.ndarray
+            (...,) boolean mask of valid vectors
+        """
+        X = np.asarray(X)
+        if X.shape[-1:] != self.shape:
+            return np.zeros(X.shape[:-1], dtype=bool)
+        range_predicate = np.all((X >= self.low) & (X <= self.high), axis=-1)
+        budget_constraint = np.abs(X.sum(axis=-1) - 1.0) < tolerance
+        valid = range_predicate & budget_constraint
+        mask = self.mask if mask is None else mask
+        if mask is not None:
+            valid &= ~np.any((X != 0) & ~mask, axis=-1)
+        return valid
+
+    def project(self, X, mask=None):
+        """Euclidean projection of (..., M) vectors `X` onto space,
+        with (..., M) boolean `mask`, defaults to `mask` of the space."""
+        mask = self.mask if mask is None else mask
+        return simplex_projection(X, self.long_only, mask)
 
     @property
     def shape(self):
@@ -0,0 +1,397 @@
+import numpy as np
+import pandas as pd
+import typing
+import tempfile
+import os
+
+import gym
+
+import qtrader
+from qtrader.envs.accumulators import Accumulators
+from qtrader.envs.base import AgentsMixin
+
+
+class StreamEnv(AgentsMixin, gym.Env):
+    """OpenAI Gym Streaming Trading Environment, consuming bars
+    one at a time and holding only a bounded lookback window,
+    while agents' records are appended to files on disk.
+
+    Bars are prices at the trading period, e.g. chunks of
+    `pandas.read_csv(..., chunksize=n)`, they are neither resampled
+    nor cleaned, except for bars with missing prices being skipped.
+
+    Attributes
+    ----------
+    universe: list
+        List of instruments universe
+    action_space: qtrader.envs.spaces.PortfolioVector
+        Agent's action space
+    observation_space: gym.Space
+        Agent's observation space
+    agents: dict
+        On-disk records of registered agents
+    window: int
+        Lookback of windowed observations, `None` for single rows
+    path: str
+        Directory of agents' records files, temporary
+        unless given, removed on `close`
+    repair: bool
+        Project invalid actions onto the action space, instead of raising
+    reward: str
+        Reward function, 'returns' or 'differential_sharpe_ratio'
+
+    Methods
+    -------
+    step(action)
+        The agent takes a step in the environment
+    reset()
+        Restarts the stream and returns an initial observation
+    register(agent)
+        Add an agent to the environment (stock market)
+    close()
+        Close agents' records files, removing temporary ones
+    """
+
+    class Record:
+        """Append-only on-disk data structure for actions and rewards
+        records, with one fixed-size binary row per date.
+
+        Attributes
+        ----------
+        actions: pandas.DataFrame
+            Table of actions performed by agent
+        rewards: pandas.DataFrame
+            Table of rewards received by agent
+        pnl: pandas.Series
+            Wealth level of agent
+        """
+
+        def __init__(self, path: str, columns: typing.List[str]):
+            self.path = path
+            self.columns = columns
+            dtype = qtrader.framework.DTYPE
+            self.dtype = np.dtype([('date', 'M8[ns]'),
+                                   ('actions', dtype, (len(columns),)),
+                                   ('rewards', dtype, (len(columns),)),
+                                   ('wealth', dtype)])
+            self._file = open(path, 'wb')
+
+        def append(self, row: np.void):
+            """Append a row of `dtype`."""
+            self._file.write(row.tobytes())
+
+        def close(self):
+            self._file.close()
+
+        def _read(self) -> np.ndarray:
+            if not self._file.closed:
+                self._file.flush()
+            return np.fromfile(self.path, dtype=self.dtype)
+
+        @property
+        def index(self) -> pd.DatetimeIndex:
+            return pd.DatetimeIndex(self._read()['date'])
+
+        @property
+        def actions(self) -> pd.DataFrame:
+            """Table of actions performed by agent."""
+            data = self._read()
+            return pd.DataFrame(data['actions'],
+                                index=pd.DatetimeIndex(data['date']),
+                                columns=self.columns)
+
+        @property
+        def rewards(self) -> pd.DataFrame:
+            """Table of rewards received by agent."""
+            data = self._read()
+            return pd.DataFrame(data['rewards'],
+                                index=pd.DatetimeIndex(data['date']),
+                                columns=self.columns)
+
+        @property
+        def pnl(self) -> pd.Series:
+            """Wealth level of agent."""
+            data = self._read()
+            return pd.Series(data['wealth'],
+                             index=pd.DatetimeIndex(data['date']))
+
+    def __init__(self,
+                 bars: typing.Union[typing.Iterable,
+                                    typing.Callable[[], typing.Iterable]],
+                 universe: typing.Optional[typing.List[str]] = None,
+                 cash: bool = True,
+                 window: typing.Optional[int] = None,
+                 path: typing.Optional[str] = None,
+                 repair: bool = False,
+                 reward: str = 'returns'):
+        """Constructs a `StreamEnv` object.
+
+        Parameters
+        ----------
+        bars: iterable | callable
+            Iterable of `pandas.DataFrame` chunks, `pandas.Series`
+            rows named by date or (date, prices) pairs, or callable
+            returning such iterable, called again on `reset`
+        universe: list, optional
+            Instruments to select, defaults to columns of the first bar,
+            required for (date, prices) pairs
+        cash: bool, optional
+            Add cash instrument
+        window: int, optional
+            Lookback of windowed observations
+        path: str, optional
+            Directory of agents' records, defaults to a temporary
+            one, removed on `close`
+        repair: bool, optional
+            Project invalid actions onto the action space
+        reward: str, optional
+            Reward function, 'returns' or 'differential_sharpe_ratio'
+        """
+        if window is not None and window < 1:
+            raise ValueError('`window` should be a positive integer')
+        if reward not in ('returns', 'differential_sharpe_ratio'):
+            raise ValueError('unrecognised `reward`: %s' % reward)
+        self._source = bars
+        self._universe = universe
+        self.cash = cash
+        self.window = window
+        # owned temporary directory, removed on `close` or collection
+        self._tmp = tempfile.TemporaryDirectory(prefix='qtrader-') \
+            if path is None else None
+        self.path = path if path is not None else self._tmp.name
+        if not os.path.exists(self.path):
+            os.makedirs(self.path, exist_ok=True)
+        self.repair = repair
+        self.reward = reward
+        # --------------------------------------------------------------------------
+        # dictionary of registered agents
+        self.agents = {}
+        self._accumulators = Accumulators(0)
+        # prime the stream, fixing the universe
+        self._counter = 0
+        self._start()
+        # --------------------------------------------------------------------------
+        # risky assets (& cash) under consideration
+        num_instruments: int = len(self.universe)
+        # risky assets & cash portfolio vector
+        self.action_space = qtrader.envs.spaces.PortfolioVector(
+            num_instruments)
+        # risky assets & cash prices vector, or window of vectors
+        if window is None:
+            ob_shape = (num_instruments,)
+        else:
+            ob_shape = (window, num_instruments)
+        self.observation_space = gym.spaces.Box(-np.inf,
+                                                np.inf,
+                                                ob_shape,
+                                                dtype=qtrader.framework.DTYPE)
+
+    @property
+    def universe(self):
+        """List of instruments universe."""
+        return self._columns
+
+    @property
+    def index(self) -> pd.Timestamp:
+        """Current index."""
+        return self._date
+
+    def _bars(self) -> typing.Iterator[typing.Tuple[pd.Timestamp,
+                                                    np.ndarray]]:
+        """Generator of (date, prices) of valid bars."""
+        source = self._source() if callable(self._source) else self._source
+        for chunk in source:
+            if isinstance(chunk, (pd.DataFrame, pd.Series)):
+                if self._universe is None:
+                    self._universe = chunk.index.tolist() \
+                        if isinstance(chunk, pd.Series) \
+                        else chunk.columns.tolist()
+                chunk = chunk[self._universe]
+            if isinstance(chunk, pd.DataFrame):
+                rows = zip(chunk.index,
+                           chunk.values.astype(qtrader.framework.DTYPE))
+            elif isinstance(chunk, pd.Series):
+                rows = [(chunk.name,
+                         chunk.values.astype(qtrader.framework.DTYPE))]
+            else:
+                if self._universe is None:
+                    raise ValueError(
+                        '`universe` is required for (date, prices) bars')
+                rows = [(chunk[0],
+                         np.asarray(chunk[1], dtype=qtrader.framework.DTYPE))]
+            for date, row in rows:
+                # missing prices, as `qtrader.utils.pandas.clean`
+                if np.all(np.isfinite(row)):
+                    if self.cash:
+                        row = np.append(row, row.dtype.type(1.0))
+                    yield pd.Timestamp(date), row
+
+    def _push(self, date: pd.Timestamp, prices: np.ndarray):
+        """Move the lookback window to bar (`date`, `prices`)."""
+        returns = prices / self._ring[0][self._head + self._size] - 1
+        self._head = (self._head + 1) % self._size
+        # each row written twice, so that windows are contiguous
+        for ring, row in zip(self._ring, (prices, returns)):
+            ring[self._head] = ring[self._head + self._size] = row
+        self._date = date
+
+    def _start(self):
+        """(Re)start the stream from its first bar."""
+        self._iterator = self._bars()
+        try:
+            date, prices = next(self._iterator)
+        except StopIteration:
+            raise ValueError('no valid bars in the stream')
+        self._columns = list(self._universe) + (['CASH'] if self.cash else [])
+        # (2 * window, M) ring buffers of prices & returns, with
+        # history before the first bar: flat prices, unknown returns
+        self._size = self.window or 1
+        self._ring = (np.tile(prices, (2 * self._size, 1)),
+                      np.full((2 * self._size, len(prices)), np.nan,
+                              dtype=prices.dtype))
+        self._head = self._size - 1
+        self._date = date
+        self._next = next(self._iterator, None)
+
+    def _get_observation(self) -> object:
+        ob = {}
+        lo, hi = self._head + 1, self._head + self._size + 1
+        if self.window is not None:
+            ob['prices'] = self._ring[0][lo:hi].copy()
+            ob['returns'] = self._ring[1][lo:hi].copy()
+            return ob
+        ob['prices'] = pd.Series(self._ring[0][hi - 1],
+                                 index=self.universe, name=self.index)
+        ob['returns'] = pd.Series(self._ring[1][hi - 1],
+                                  index=self.universe, name=self.index)
+        return ob
+
+    def _get_reward(self, action) -> np.ndarray:
+        return self._ring[1][self._head + self._size] * action
+
+    def _get_done(self) -> bool:
+        return self._next is None
+
+    def _get_info(self) -> dict:
+        # running reward & risk statistics
+        return self._accumulators.info()
+
+    def _append(self, records: typing.Sequence[Record],
+                actions: np.ndarray, rewards: np.ndarray,
+                wealth: np.ndarray):
+        """Append one row per record, at the current date."""
+        if len(records) == 0:
+            return None
+        rows = np.empty(len(records), dtype=records[0].dtype)
+        rows['date'] = self._date
+        rows['actions'] = actions
+        rows['rewards'] = rewards
+        rows['wealth'] = wealth
+        for record, row in zip(records, rows):
+            record.append(row)
+
+    def _initialize(self, records: typing.Sequence[Record]):
+        """Append initial portfolio vectors & rewards to `records`."""
+        actions = np.zeros(len(self.universe))
+        if 'CASH' in self.universe:
+            actions[self.universe.index('CASH')] = 1.0
+        self._append(records, actions, 0.0, 1.0)
+
+    def _add_agent(self, name: str):
+        """Add a record file of agent `name`, starting at the current date."""
+        record = self.Record(os.path.join(self.path, '%s.bin' % name),
+                             self.universe)
+        self.agents[name] = record
+        self._initialize([record])
+
+    def _remove_agent(self, name: str):
+        """Close the record file of agent `name`."""
+        self.agents.pop(name).close()
+
+    def _clear_agents(self):
+        """Close the record files of all agents."""
+        for record in self.agents.values():
+            record.close()
+        self.agents = {}
+        self._accumulators = Accumulators(0)
+
+    #######
+    # API
+    #######
+
+    def step(self, action: typing.Union[np.ndarray, typing.Dict[str, object]]):
+        """The agent takes a step in the environment, see `BaseEnv.step`.
+
+        Parameters
+        ----------
+        action: numpy.ndarray | dict
+            Portfolio vectors, per agent name, or (A, M) matrix
+            of portfolio vectors, in order of registration
+
+        Returns
+        -------
+        observation, reward, episode_over, info: tuple
+            * observation: object
+                Observation of the environment
+            * reward: dict | numpy.ndarray
+                Rewards received after this step, per agent
+                name, or (A,) vector for matrix `action`
+            * done: bool
+                Flag for finished stream
+            * info: dict
+                Running reward & risk statistics of agents,
+                see `qtrader.envs.accumulators.Accumulators`
+        """
+        self._validate_agents()
+        if self._next is None:
+            raise RuntimeError('stream exhausted, `reset` is required')
+        A = self._parse_actions(action)
+        # timestep
+        self._counter += 1
+        self._push(*self._next)
+        self._next = next(self._iterator, None)
+        # fetch return values
+        observation = self._get_observation()
+        done = self._get_done()
+        rewards = self._get_reward(A)
+        # return value
+        reward = rewards.sum(axis=1)
+        # running reward & risk statistics
+        self._accumulators.update(reward)
+        # append-only records
+        self._append(list(self.agents.values()), A, rewards,
+                     self._accumulators.wealth)
+        reward, info = self._format_step(action, reward, self._get_info())
+        return observation, reward, done, info
+
+    def reset(self) -> object:
+        """Restart the stream, unless not stepped yet, truncating
+        the agents' records, and returns an initial observation.
+
+        Returns
+        -------
+        observation: object
+            The initial observation of the space.
+        """
+        self._validate_agents()
+        if self._counter > 0:
+            self._counter = 0
+            self._start()
+        # fresh records
+        for record in self.agents.values():
+            record.close()
+        self.agents = {name: self.Record(record.path, self.universe)
+                       for name, record in self.agents.items()}
+        self._accumulators = Accumulators(len(self.agents))
+        self._initialize(list(self.agents.values()))
+        # get initial observation
+        ob = self._get_observation()
+        return ob
+
+    def close(self):
+        """Close agents' records files, removing the
+        temporary directory of records, if owned."""
+        for record in self.agents.values():
+            record.close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
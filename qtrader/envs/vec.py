@@ -0,0 +1,230 @@
+import numpy as np
+import typing
+
+import gym
+
+import qtrader
+from qtrader.envs.base import BaseEnv
+
+
+class VecEnv(gym.Env):
+    """OpenAI Gym Vectorized Trading Environment,
+    stepping `N` episodes in lockstep.
+
+    Follows the conventions of `gym.vector` environments, batched spaces,
+    `step_async`/`step_wait` and automatic reset of finished episodes
+    with their last observation in `info['final_observation']`, with
+    the (observation, reward, done, info) steps of `BaseEnv` instead of
+    subclassing `gym.vector.VectorEnv`. Episodes finish together.
+
+    Single-row observations and returns rewards only: environments
+    configured with `window`, `ragged`, `repair` or another `reward`
+    are rejected.
+
+    Attributes
+    ----------
+    num_envs: int
+        Number of episodes `N` stepped in lockstep
+    universe: list
+        List of instruments universe
+    single_action_space: qtrader.envs.spaces.PortfolioVector
+        Action space of a single episode
+    single_observation_space: gym.Space
+        Observation space of a single episode
+    action_space: gym.spaces.Box
+        Batched (N, M) action space
+    observation_space: gym.spaces.Box
+        Batched (N, M) observation space
+
+    Methods
+    -------
+    step(actions)
+        Take an (N, M) matrix of portfolio vectors in all episodes
+    step_async(actions)
+        Queue an (N, M) matrix of portfolio vectors
+    step_wait()
+        Execute queued portfolio vectors
+    reset()
+        Resets all episodes and returns batched initial observations
+    """
+
+    def __init__(self, envs: typing.List[BaseEnv], tolerance: float = 1e-5):
+        """Constructs a `VecEnv` object.
+
+        Parameters
+        ----------
+        envs: list
+            Trading environments, one per episode, with price
+            panels of the same (T, M) shape
+        tolerance: float, optional
+            Budget constraint tolerance
+        """
+        if len(envs) == 0:
+            raise ValueError('at least one environment is required')
+        if len({env._prices_buffer.shape for env in envs}) != 1:
+            raise ValueError('price panels of environments must share shape')
+        for env in envs:
+            if env.window is not None or env.ragged or env.repair or \
+                    env.reward != 'returns':
+                raise ValueError(
+                    'unsupported `window`, `ragged`, `repair` or '
+                    '`reward` options of environment')
+        # --------------------------------------------------------------------------
+        self.num_envs: int = len(envs)
+        self.tolerance = tolerance
+        self._dates = envs[0].dates
+        self._columns = envs[0].universe
+        # (T, N, M) buffers, time-major so that each step is contiguous
+        if all(env is envs[0] for env in envs):
+            # same panel: broadcast without copying
+            T, M = envs[0]._prices_buffer.shape
+            self._prices_buffer = np.broadcast_to(
+                envs[0]._prices_buffer[:, None, :], (T, self.num_envs, M))
+            self._returns_buffer = np.broadcast_to(
+                envs[0]._returns_buffer[:, None, :], (T, self.num_envs, M))
+        else:
+            self._prices_buffer = np.stack(
+                [env._prices_buffer for env in envs], axis=1)
+            self._returns_buffer = np.stack(
+                [env._returns_buffer for env in envs], axis=1)
+        # --------------------------------------------------------------------------
+        # single episode spaces, not shared with the environments
+        num_instruments: int = len(self.universe)
+        self.single_action_space = qtrader.envs.spaces.PortfolioVector(
+            num_instruments, envs[0].action_space.long_only)
+        self.single_observation_space = gym.spaces.Box(
+            -np.inf, np.inf, (num_instruments,),
+            dtype=envs[0].observation_space.dtype)
+        # batched spaces
+        self.action_space = gym.spaces.Box(-np.inf,
+                                           np.inf,
+                                           (self.num_envs, num_instruments),
+                                           dtype=np.float32)
+        self.observation_space = gym.spaces.Box(-np.inf,
+                                                np.inf,
+                                                (self.num_envs,
+                                                 num_instruments),
+                                                dtype=np.float32)
+        # --------------------------------------------------------------------------
+        # counter to follow time index
+        self._counter = 0
+        # queued actions of `step_async`
+        self._actions = None
+
+    @property
+    def universe(self):
+        """List of instruments universe."""
+        return self._columns
+
+    @property
+    def dates(self):
+        """Dates of the first environment prices."""
+        return self._dates
+
+    @property
+    def _max_episode_steps(self) -> int:
+        """Number of timesteps available."""
+        return len(self._dates)
+
+    def _get_observation(self) -> object:
+        ob = {}
+        ob['prices'] = self._prices_buffer[self._counter]
+        ob['returns'] = self._returns_buffer[self._counter]
+        return ob
+
+    def _get_reward(self, actions) -> np.ndarray:
+        return np.einsum('nm,nm->n',
+                         self._returns_buffer[self._counter], actions)
+
+    def _get_done(self) -> np.ndarray:
+        return np.full(self.num_envs,
+                       self._counter == len(self._dates) - 1)
+
+    def _get_info(self) -> dict:
+        return {}
+
+    def _validate_actions(self, actions) -> np.ndarray:
+        """Broadcast and check batched portfolio vectors."""
+        try:
+            actions = np.broadcast_to(np.asarray(actions, dtype=float),
+                                      self.action_space.shape)
+        except ValueError:
+            raise ValueError(
+                'invalid shape of `actions` attempted: %s' %
+                (np.shape(actions),))
+        invalid = ~self.single_action_space.contains_many(actions,
+                                                          self.tolerance)
+        if invalid.any():
+            raise ValueError(
+                'invalid `actions` attempted in episodes: %s' %
+                np.flatnonzero(invalid))
+        return actions
+
+    #######
+    # API
+    #######
+
+    def step(self, actions: np.ndarray):
+        """The agents take a step in all episodes.
+
+        Parameters
+        ----------
+        actions: numpy.ndarray
+            (N, M) matrix of portfolio vectors
+
+        Returns
+        -------
+        observation, reward, episode_over, info: tuple
+            * observation: dict
+                Batched (N, M) observations of the environments
+            * reward: numpy.ndarray
+                (N,) rewards received after this step
+            * done: numpy.ndarray
+                (N,) flags for finished episodes
+            * info: dict
+                Information about this step, with the last
+                observation as 'final_observation' of finished
+                episodes, since they are reset
+        """
+        actions = self._validate_actions(actions)
+        # timestep
+        self._counter += 1
+        # fetch return values
+        observation = self._get_observation()
+        reward = self._get_reward(actions)
+        done = self._get_done()
+        info = self._get_info()
+        # automatic reset, as `gym.vector` environments
+        if done.all():
+            info['final_observation'] = observation
+            observation = self.reset()
+        return observation, reward, done, info
+
+    def step_async(self, actions: np.ndarray):
+        """Queue (N, M) matrix of portfolio vectors."""
+        self._actions = actions
+
+    def step_wait(self):
+        """Execute queued portfolio vectors, see `step`."""
+        if self._actions is None:
+            raise RuntimeError('`step_async` must be called before')
+        actions, self._actions = self._actions, None
+        return self.step(actions)
+
+    def reset(self) -> object:
+        """Reset all episodes and returns batched initial observations.
+
+        Returns
+        -------
+        observation: dict
+            Batched (N, M) initial observations.
+        """
+        # set time to zero
+        self._counter = 0
+        # get initial observation
+        ob = self._get_observation()
+        return ob
+
+    def close(self):
+        """Discard queued portfolio vectors."""
+        self._actions = None
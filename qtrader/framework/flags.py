@@ -4,3 +4,5 @@ LOG_NAME = 'qtrader'
 LOG_LEVEL = 'ERROR'  # 'INFO' | 'DEBUG' | 'WARNING' | 'ERROR'
 # seed random number
 RNG_SEED = 0
+# floating point precision of prices, returns & records
+DTYPE = 'float64'  # 'float64' | 'float32'
@@ -1,6 +1,7 @@
 from qtrader.utils import econometric
 from qtrader.utils import gym
 from qtrader.utils import numpy
+from qtrader.utils import online
 from qtrader.utils import pandas
 from qtrader.utils import plotting
 from qtrader.utils import preprocessor
@@ -84,6 +84,15 @@ def hit_ratio(returns):
     return np.sum(returns > 0, axis=0) / len(returns)
 
 
+def _average_win_loss(returns):
+    """Average positive & negative returns, column-wise."""
+    wins, losses = returns > 0, returns < 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aw = np.where(wins, returns, 0.0).sum(axis=0) / wins.sum(axis=0)
+        al = np.where(losses, returns, 0.0).sum(axis=0) / losses.sum(axis=0)
+    return aw, al
+
+
 def awal(returns):
     """Computes Average Win to Average Loss ratio.
 
@@ -99,8 +108,7 @@ def awal(returns):
     """
     if returns.ndim > 2:
         raise ValueError('returns tensor cannot be handled')
-    aw = returns[returns > 0].mean(axis=0)
-    al = returns[returns < 0].mean(axis=0)
+    aw, al = _average_win_loss(returns)
     return np.abs((aw+eps)/(al+eps))
 
 
@@ -121,32 +129,41 @@ def appt(returns):
         raise ValueError('returns tensor cannot be handled')
     pw = np.sum(returns > 0, axis=0) / len(returns)
     pl = np.sum(returns < 0, axis=0) / len(returns)
-    aw = returns[returns > 0].mean(axis=0)
-    al = returns[returns < 0].mean(axis=0)
+    aw, al = _average_win_loss(returns)
     return pw * aw - pl * al
 
 
+def _cummax(x):
+    """Expanding maximum of `x` along the first axis."""
+    if isinstance(x, (pd.Series, pd.DataFrame)):
+        return x.cummax(axis=0)
+    return np.maximum.accumulate(x, axis=0)
+
+
 def drawdown(returns):
     """Computes Drawdown given simple returns.
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    drawdown : pandas.Series
+    drawdown : np.ndarray | pd.Series | pd.DataFrame
         Drawdown of strategy.
     """
+    if returns.ndim > 2:
+        raise ValueError('returns tensor cannot be handled')
     _cum_returns = cum_returns(returns)
-    expanding_max = _cum_returns.expanding(1).max()
+    expanding_max = _cummax(_cum_returns)
     drawdown = expanding_max - _cum_returns
     return drawdown
 
 
 def _drawdown(returns):
-    """Computes Drawdown given simple returns.
+    """Computes Drawdown given simple returns, undefined
+    on the first date, see `drawdown`.
 
     Parameters
     ----------
@@ -158,13 +175,9 @@ def _drawdown(returns):
     drawdown : pandas.Series
         Drawdown of strategy.
     """
-    _cum_returns = cum_returns(returns)
-    drawdown = pd.Series(index=_cum_returns.index, name='drawdown')
-    for T in _cum_returns.index[1:]:
-        X_t = _cum_returns.loc[:T]
-        X_T = _cum_returns.loc[T]
-        drawdown.loc[T] = max([0, X_t.max() - X_T])
-    return drawdown
+    out = drawdown(returns).astype(float).rename('drawdown')
+    out.iloc[:1] = np.nan
+    return out
 
 
 def max_drawdown(returns):
@@ -172,16 +185,34 @@ def max_drawdown(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    max_drawdown : pandas.Series
+    max_drawdown : np.ndarray | pd.Series | pd.DataFrame
         Max drawdown of strategy.
     """
     _drawdown = drawdown(returns)
-    return _drawdown.expanding(1).max()
+    return _cummax(_drawdown)
+
+
+def _drawdown_time(_drawdown, dates=None, periods=None):
+    """Average time between dates without drawdown, per column
+    of (T, K) `_drawdown`, as `pandas.TimedeltaIndex` given `dates`,
+    otherwise in number of periods, counted by (T, K) `periods` if
+    given, e.g. skipping missing returns, undefined for less than two."""
+    zero = _drawdown == 0
+    count = zero.sum(axis=0)
+    first = np.argmax(zero, axis=0)
+    last = len(zero) - 1 - np.argmax(zero[::-1], axis=0)
+    intervals = np.maximum(count - 1, 1)
+    if dates is None:
+        if periods is not None:
+            first, last = (np.take_along_axis(periods, i[np.newaxis], 0)[0]
+                           for i in (first, last))
+        return np.where(count > 1, (last - first) / intervals, np.nan)
+    return ((dates[last] - dates[first]) / intervals).where(count > 1)
 
 
 def average_drawdown_time(returns):
@@ -189,16 +220,159 @@ def average_drawdown_time(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
-        Returns of the strategy as a percentage, noncumulative.
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative,
+        time in number of periods unless indexed by dates.
 
     Returns
     -------
-    average_drawdown_time : datetime.timedelta
+    average_drawdown_time : datetime.timedelta | float | np.ndarray | pd.Series
         Average drawdown time of strategy.
     """
     _drawdown = drawdown(returns)
-    return _drawdown[_drawdown == 0].index.to_series().diff().mean()
+    index = getattr(returns, 'index', None)
+    dates = index if isinstance(index, pd.DatetimeIndex) else None
+    values = np.asarray(_drawdown)
+    out = _drawdown_time(values.reshape(len(values), -1), dates)
+    if isinstance(_drawdown, pd.DataFrame):
+        return pd.Series(out, index=_drawdown.columns,
+                         name='average_drawdown_time')
+    return out if values.ndim == 2 else out[0]
+
+
+def _drawdown_episodes(_drawdown):
+    """Drawdown episodes of (T, K) `_drawdown` in linear time, as
+    positions of column, peak, trough & end, i.e. recovery date or
+    `T` while underwater, and depth, ordered by column & peak."""
+    T, K = _drawdown.shape
+    # underwater runs, a dry sentinel closes each column
+    padded = np.zeros((K, T + 1))
+    padded[:, :T] = _drawdown.T
+    flat = padded.ravel()
+    change = np.diff((flat > 0).astype(np.int8), prepend=0)
+    starts = np.flatnonzero(change == 1)
+    ends = np.flatnonzero(change == -1)
+    column, start = np.divmod(starts, T + 1)
+    end = ends - column * (T + 1)
+    if len(starts) == 0:
+        return column, start, start, end, np.zeros(0)
+    depth = np.maximum.reduceat(flat, starts)
+    # trough, first date at the depth of each episode
+    lengths = ends - starts
+    episode = np.repeat(np.arange(len(starts)), lengths)
+    positions = np.arange(lengths.sum()) + \
+        np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    hit = flat[positions] == depth[episode]
+    first = np.diff(episode[hit], prepend=-1) != 0
+    trough = positions[hit][first] - column * (T + 1)
+    return column, start - 1, trough, end, depth
+
+
+def drawdown_episodes(returns):
+    """Computes Drawdown Episodes given simple returns, from the
+    peak before going underwater until recovery to that peak.
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series
+        Returns of the strategy as a percentage, noncumulative,
+        dates in number of periods unless indexed by dates.
+
+    Returns
+    -------
+    episodes : pd.DataFrame
+        Peak, trough & recovery dates, missing while underwater,
+        depth, duration from peak to recovery or last date, and
+        time to recover from trough, of each episode.
+    """
+    values = np.asarray(returns, dtype=float)
+    if values.ndim != 1:
+        raise ValueError('returns vector is required')
+    index = getattr(returns, 'index', None)
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.RangeIndex(len(values))
+    _, peak, trough, end, depth = _drawdown_episodes(
+        drawdown(values)[:, np.newaxis])
+    recovered = end < len(values)
+    last = np.minimum(end, len(values) - 1)
+    return pd.DataFrame({
+        'peak': index[peak],
+        'trough': index[trough],
+        'recovery': pd.Series(index[last]).where(recovered),
+        'depth': depth,
+        'duration': index[last] - index[peak],
+        'time_to_recover':
+            pd.Series(index[last] - index[trough]).where(recovered)
+    })
+
+
+def _episode_durations(returns):
+    """Column & duration of drawdown episodes of `returns`, in number
+    of periods or nanoseconds when indexed by dates, and dates."""
+    values = np.asarray(returns, dtype=float)
+    if values.ndim > 2:
+        raise ValueError('returns tensor cannot be handled')
+    R = values.reshape(len(values), -1)
+    column, peak, _, end, _ = _drawdown_episodes(drawdown(R))
+    last = np.minimum(end, len(R) - 1)
+    index = getattr(returns, 'index', None)
+    if isinstance(index, pd.DatetimeIndex):
+        duration = np.asarray(index[last] - index[peak], dtype='m8[ns]')
+        return column, duration.view(np.int64), index
+    return column, last - peak, None
+
+
+def _like(returns, values, dates):
+    """Per strategy `values` of durations, shaped as `returns`."""
+    if dates is not None:
+        values = pd.to_timedelta(values, unit='ns')
+    if isinstance(returns, pd.DataFrame):
+        return pd.Series(values, index=returns.columns)
+    return values if np.ndim(returns) == 2 else values[0]
+
+
+def max_drawdown_duration(returns):
+    """Computes Max Drawdown Duration given simple returns,
+    see `drawdown_episodes`.
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative,
+        time in number of periods unless indexed by dates.
+
+    Returns
+    -------
+    max_drawdown_duration : datetime.timedelta | int | np.ndarray | pd.Series
+        Longest drawdown duration of strategy, zero if never underwater.
+    """
+    column, duration, dates = _episode_durations(returns)
+    longest = np.zeros(int(np.prod(np.shape(returns)[1:])), dtype=np.int64)
+    np.maximum.at(longest, column, duration)
+    return _like(returns, longest, dates)
+
+
+def average_drawdown_duration(returns):
+    """Computes Average Drawdown Duration given simple returns,
+    see `drawdown_episodes`.
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative,
+        time in number of periods unless indexed by dates.
+
+    Returns
+    -------
+    average_drawdown_duration : datetime.timedelta | float | np.ndarray | pd.Series
+        Average drawdown duration of strategy, undefined if never underwater.
+    """
+    column, duration, dates = _episode_durations(returns)
+    K = int(np.prod(np.shape(returns)[1:]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average = np.bincount(column, duration, minlength=K) / \
+            np.bincount(column, minlength=K)
+    return _like(returns, average, dates)
 
 
 def mean_returns(returns):
@@ -206,15 +380,15 @@ def mean_returns(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    mean_returns : float
+    mean_returns : float | np.ndarray | pd.Series
         Mean returns of strategy.
     """
-    return returns.mean(axis=0)
+    return np.mean(returns, axis=0)
 
 
 def std_returns(returns):
@@ -222,15 +396,15 @@ def std_returns(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    std_returns : float
+    std_returns : float | np.ndarray | pd.Series
         Standard deviation of returns of strategy.
     """
-    return returns.std(axis=0)
+    return np.std(returns, axis=0, ddof=1)
 
 
 def skewness(returns):
@@ -238,15 +412,20 @@ def skewness(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    skew_returns : float
+    skew_returns : float | np.ndarray | pd.Series
         Skewness of returns of strategy.
     """
-    return returns.skew(axis=0)
+    if isinstance(returns, (pd.Series, pd.DataFrame)):
+        return returns.skew(axis=0)
+    R = np.asarray(returns, dtype=float)
+    _, m2, m3, _ = _moments(R)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _skewness(len(R), m2, m3)[()]
 
 
 def kurtosis(returns):
@@ -254,15 +433,20 @@ def kurtosis(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    kurt_returns : float
+    kurt_returns : float | np.ndarray | pd.Series
         Skewness of returns of strategy.
     """
-    return returns.kurt(axis=0)
+    if isinstance(returns, (pd.Series, pd.DataFrame)):
+        return returns.kurt(axis=0)
+    R = np.asarray(returns, dtype=float)
+    _, m2, _, m4 = _moments(R)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _kurtosis(len(R), m2, m4)[()]
 
 
 def tail_ratio(returns):
@@ -270,16 +454,16 @@ def tail_ratio(returns):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
 
     Returns
     -------
-    tail_ratio : float
+    tail_ratio : float | np.ndarray
         Tail ratio of returns of strategy.
     """
-    return np.abs(np.percentile(returns, 95)) / \
-        np.abs(np.percentile(returns, 5))
+    return np.abs(np.percentile(returns, 95, axis=0)) / \
+        np.abs(np.percentile(returns, 5, axis=0))
 
 
 def value_at_risk(returns, cutoff=0.05):
@@ -287,17 +471,17 @@ def value_at_risk(returns, cutoff=0.05):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
     cutoff : float, optional
         Decimal representing the percentage cutoff for the bottom percentile of returns.
 
     Returns
     -------
-    VaR : float
+    VaR : float | np.ndarray
         The VaR value.
     """
-    return np.percentile(returns, 100 * cutoff)
+    return np.percentile(returns, 100 * cutoff, axis=0)
 
 
 def conditional_value_at_risk(returns, cutoff=0.05):
@@ -308,14 +492,14 @@ def conditional_value_at_risk(returns, cutoff=0.05):
 
     Parameters
     ----------
-    returns : pandas.Series
+    returns : np.ndarray | pd.Series | pd.DataFrame
         Returns of the strategy as a percentage, noncumulative.
     cutoff : float, optional
         Decimal representing the percentage cutoff for the bottom percentile of returns.
 
     Returns
     -------
-    CVaR : float
+    CVaR : float | np.ndarray
         The CVaR value.
     """
     # PERF: Instead of using the 'value_at_risk' function to find the cutoff
@@ -323,4 +507,396 @@ def conditional_value_at_risk(returns, cutoff=0.05):
     # index manually and partition out the lowest returns values. The value at
     # the cutoff index should be included in the partition.
     cutoff_index = int((len(returns) - 1) * cutoff)
-    return np.mean(np.partition(returns, cutoff_index)[:cutoff_index + 1])
+    return np.mean(np.partition(returns, cutoff_index, axis=0)
+                   [:cutoff_index + 1], axis=0)
+
+
+def _quantile(sorted_returns, q, counts):
+    """Linear interpolation quantile, as `numpy.percentile`, of
+    (T, K) `sorted_returns` along the first axis, of their leading
+    (K,) `counts` per column, e.g. missing returns sorted last."""
+    index = (counts - 1) * q
+    lower = np.floor(index).astype(int)
+    upper = np.minimum(lower + 1, counts - 1)
+    weight = index - lower
+    lower, upper = (np.take_along_axis(sorted_returns, i[np.newaxis], 0)[0]
+                    for i in (lower, upper))
+    return lower + (upper - lower) * weight
+
+
+def _moments(R, valid=None):
+    """Mean and sums of 2nd, 3rd & 4th central powers,
+    of (T, ...) `R` along the first axis, of the `valid`
+    returns only if given."""
+    if valid is None:
+        mean = R.mean(axis=0)
+        deviation = R - mean
+    else:
+        mean = np.where(valid, R, 0.0).sum(axis=0) / valid.sum(axis=0)
+        deviation = np.where(valid, R - mean, 0.0)
+    deviation2 = deviation ** 2
+    m2 = deviation2.sum(axis=0)
+    m3 = (deviation2 * deviation).sum(axis=0)
+    m4 = (deviation2 ** 2).sum(axis=0)
+    return mean, m2, m3, m4
+
+
+def _skewness(T, m2, m3):
+    """Bias-corrected skewness, as `pandas`, from `_moments`,
+    undefined for less than 3 returns."""
+    return np.where(
+        T < 3, np.nan, np.where(
+            m2 == 0, 0.0, T * np.sqrt(T - 1) / (T - 2) * m3 / m2 ** 1.5))
+
+
+def _kurtosis(T, m2, m4):
+    """Bias-corrected excess kurtosis, as `pandas`, from `_moments`,
+    undefined for less than 4 returns."""
+    return np.where(
+        T < 4, np.nan, np.where(
+            m2 == 0, 0.0,
+            T * (T + 1) * (T - 1) * m4 / ((T - 2) * (T - 3) * m2 ** 2) -
+            3 * (T - 1) ** 2 / ((T - 2) * (T - 3))))
+
+
+def metrics(returns, dates=None, cutoff=0.05):
+    """Computes all statistics of `qtrader.utils.summary.stats` in
+    a single pass over the returns, sharing the intermediate
+    cumulative returns, drawdown, moments, partitions and tails.
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative,
+        (T,) or (T, K) for `K` strategies, missing returns skipped.
+    dates : pd.DatetimeIndex, optional
+        Dates of `returns`, for drawdown time in days,
+        otherwise in number of periods.
+    cutoff : float, optional
+        Decimal representing the percentage cutoff for the bottom
+        percentile of returns, of VaR & CVaR.
+
+    Returns
+    -------
+    metrics : dict
+        Statistics, named after the `econometric` functions,
+        scalars or (K,) arrays, column-wise.
+    """
+    R = np.asarray(returns, dtype=float)
+    if R.ndim > 2:
+        raise ValueError('returns tensor cannot be handled')
+    vector = R.ndim == 1
+    if vector:
+        R = R[:, np.newaxis]
+    # missing returns skipped, as `pandas`, per strategy
+    valid = ~np.isnan(R)
+    T = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # cumulative returns & drawdown, from the peak of valid dates
+        _cum_returns = np.cumprod(np.where(valid, R, 0.0) + 1, axis=0) - 1
+        peak = np.maximum.accumulate(
+            np.where(valid, _cum_returns, -np.inf), axis=0)
+        _drawdown = np.where(valid, peak - _cum_returns, np.nan)
+        # drawdown time, between dates without drawdown, in whole days
+        drawdown_time = _drawdown_time(_drawdown, dates,
+                                       np.cumsum(valid, axis=0))
+        if dates is not None:
+            drawdown_time = np.floor(
+                np.asarray(drawdown_time / pd.Timedelta(days=1)))
+        # central moments
+        mean, m2, m3, m4 = _moments(R, valid)
+        std = np.where(T > 1, np.sqrt(m2 / (T - 1)), np.nan)
+        # wins & losses partitions
+        wins, losses = R > 0, R < 0
+        pw, pl = wins.sum(axis=0) / T, losses.sum(axis=0) / T
+        aw = np.where(wins, R, 0.0).sum(axis=0) / wins.sum(axis=0)
+        al = np.where(losses, R, 0.0).sum(axis=0) / losses.sum(axis=0)
+        # tails, missing returns sorted last
+        sorted_returns = np.sort(R, axis=0)
+        lower = _quantile(sorted_returns, cutoff, T)
+        cutoff_index = ((T - 1) * cutoff).astype(int)
+        tail = np.cumsum(sorted_returns[:cutoff_index.max() + 1], axis=0)
+        out = {
+            'mean_returns': mean,
+            'cum_returns': np.where(T > 0, _cum_returns[-1], np.nan),
+            'std_returns': std,
+            'sharpe_ratio': np.sqrt(T) * mean / (np.sqrt(m2 / T) + eps),
+            'max_drawdown': np.fmax.reduce(_drawdown, axis=0),
+            'average_drawdown_time': drawdown_time,
+            'skewness': _skewness(T, m2, m3),
+            'kurtosis': _kurtosis(T, m2, m4),
+            'tail_ratio': np.abs(_quantile(sorted_returns, 0.95, T)) /
+            np.abs(_quantile(sorted_returns, 0.05, T)),
+            'value_at_risk': lower,
+            'conditional_value_at_risk':
+                np.take_along_axis(tail, cutoff_index[np.newaxis], 0)[0] /
+                (cutoff_index + 1),
+            'hit_ratio': pw,
+            'awal': np.abs((aw + eps) / (al + eps)),
+            'appt': pw * aw - pl * al
+        }
+    if vector:
+        out = {key: value[0] for key, value in out.items()}
+    return out
+
+
+def _rolling(returns, window):
+    """(T, K) returns of `returns`, for windows of `window` periods,
+    missing returns zeroed, and full windows with missing returns."""
+    if window < 2:
+        raise ValueError('window of at least 2 periods is required')
+    R = np.asarray(returns, dtype=float)
+    if R.ndim > 2:
+        raise ValueError('returns tensor cannot be handled')
+    R = R.reshape(len(R), -1)
+    missing = np.isnan(R)
+    counts = np.zeros((len(R) + 1, R.shape[1]), dtype=np.int64)
+    np.cumsum(missing, axis=0, out=counts[1:])
+    return np.where(missing, 0.0, R), counts[window:] - counts[:-window] > 0
+
+
+def _rolling_like(returns, values, window, gaps):
+    """Full windows `values`, shaped as `returns`, undefined
+    for the first `window - 1` dates and windows with `gaps`."""
+    out = np.full((len(returns),) + values.shape[1:], np.nan)
+    out[window - 1:] = np.where(gaps, np.nan, values)
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(out, index=returns.index, columns=returns.columns)
+    if isinstance(returns, pd.Series):
+        return pd.Series(out[:, 0], index=returns.index, name=returns.name)
+    return out if np.ndim(returns) == 2 else out[:, 0]
+
+
+def _rolling_moments(R, window):
+    """Mean and sum of squared deviations of (T, K) `R` over windows
+    of `window` periods, differences of cumulative sums, centred
+    against cancellation."""
+    center = R.mean(axis=0)
+    X = np.zeros((len(R) + 1, R.shape[1]))
+    X[1:] = R - center
+    S1 = np.cumsum(X, axis=0)
+    S2 = np.cumsum(X ** 2, axis=0)
+    sum1 = S1[window:] - S1[:-window]
+    sum2 = S2[window:] - S2[:-window]
+    m2 = np.maximum(sum2 - sum1 ** 2 / window, 0.0)
+    return sum1 / window + center, m2
+
+
+def rolling_mean_returns(returns, window):
+    """Computes rolling mean returns given simple returns, in O(T).
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+    window : int
+        Number of periods of each window.
+
+    Returns
+    -------
+    mean_returns : np.ndarray | pd.Series | pd.DataFrame
+        Mean returns of strategy over the trailing window.
+    """
+    R, gaps = _rolling(returns, window)
+    mean, _ = _rolling_moments(R, window)
+    return _rolling_like(returns, mean, window, gaps)
+
+
+def rolling_std_returns(returns, window):
+    """Computes rolling standard deviation of returns
+    given simple returns, in O(T).
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+    window : int
+        Number of periods of each window.
+
+    Returns
+    -------
+    std_returns : np.ndarray | pd.Series | pd.DataFrame
+        Standard deviation of returns of strategy over the trailing window.
+    """
+    R, gaps = _rolling(returns, window)
+    _, m2 = _rolling_moments(R, window)
+    return _rolling_like(returns, np.sqrt(m2 / (window - 1)), window, gaps)
+
+
+def rolling_sharpe_ratio(returns, window):
+    """Computes rolling Sharpe Ratio given simple returns, in O(T).
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+    window : int
+        Number of periods of each window.
+
+    Returns
+    -------
+    sharpe_ratio : np.ndarray | pd.Series | pd.DataFrame
+        Sharpe ratio of strategy over the trailing window.
+    """
+    R, gaps = _rolling(returns, window)
+    mean, m2 = _rolling_moments(R, window)
+    return _rolling_like(
+        returns, np.sqrt(window) * mean / (np.sqrt(m2 / window) + eps),
+        window, gaps)
+
+
+def _wavelet_matrix(column):
+    """Wavelet matrix of the ranks of `column`, Claude et al. (2015),
+    per level of bits, from the highest, the prefix counts of zero bits
+    and prefix sums of their returns, for order statistics of any
+    range of dates in O(log T), see `_select`."""
+    T = len(column)
+    order = np.argsort(column, kind='stable')
+    ranks = np.empty(T, dtype=np.int64)
+    ranks[order] = np.arange(T)
+    values = column
+    levels = []
+    for level in reversed(range(max(int(T - 1).bit_length(), 1))):
+        zero = (ranks >> level) & 1 == 0
+        zeros = np.zeros(T + 1, dtype=np.int64)
+        np.cumsum(zero, out=zeros[1:])
+        sums = np.zeros(T + 1)
+        np.cumsum(np.where(zero, values, 0.0), out=sums[1:])
+        levels.append((level, zeros, sums))
+        # stable partition, zero bits first
+        partition = np.concatenate([np.flatnonzero(zero),
+                                    np.flatnonzero(~zero)])
+        ranks, values = ranks[partition], values[partition]
+    return column[order], levels
+
+
+def _select(matrix, start, stop, k):
+    """`k`-th lowest returns (0-based) of the ranges of dates
+    [`start`, `stop`) of a `_wavelet_matrix`, and sums of the
+    returns below them, descending one level per bit."""
+    sorted_column, levels = matrix
+    rank = np.zeros(len(start), dtype=np.int64)
+    tail = np.zeros(len(start))
+    for level, zeros, sums in levels:
+        _start, _stop = zeros[start], zeros[stop]
+        count = _stop - _start
+        left = k < count
+        # returns of the left branch are lower
+        tail += np.where(left, 0.0, sums[stop] - sums[start])
+        rank |= np.where(left, 0, 1 << level)
+        k = np.where(left, k, k - count)
+        start = np.where(left, _start, zeros[-1] + start - _start)
+        stop = np.where(left, _stop, zeros[-1] + stop - _stop)
+    return sorted_column[rank], tail
+
+
+def _rolling_select(R, window, *ks):
+    """`k`-th lowest returns (0-based) of (T, K) `R` over windows of
+    `window` periods, and sums of the returns below them, per `k`."""
+    num_windows = max(len(R) - window + 1, 0)
+    out = [(np.empty((num_windows, R.shape[1])),
+            np.empty((num_windows, R.shape[1]))) for _ in ks]
+    start = np.arange(num_windows)
+    for j in range(R.shape[1] if num_windows > 0 else 0):
+        matrix = _wavelet_matrix(R[:, j])
+        for k, (values, tail) in zip(ks, out):
+            values[:, j], tail[:, j] = _select(
+                matrix, start, start + window, k)
+    return out
+
+
+def _validate_cutoff(cutoff):
+    """Check `cutoff` is a decimal percentage."""
+    if not 0 <= cutoff <= 1:
+        raise ValueError('invalid `cutoff`: %s' % cutoff)
+
+
+def rolling_value_at_risk(returns, window, cutoff=0.05):
+    """Compute rolling Value at risk (VaR) of a returns stream,
+    as order statistics of a wavelet matrix, in O(T log T).
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+    window : int
+        Number of periods of each window.
+    cutoff : float, optional
+        Decimal representing the percentage cutoff for the bottom percentile of returns.
+
+    Returns
+    -------
+    VaR : np.ndarray | pd.Series | pd.DataFrame
+        The VaR value over the trailing window.
+    """
+    _validate_cutoff(cutoff)
+    R, gaps = _rolling(returns, window)
+    # linear interpolation, as `numpy.percentile`
+    index = (window - 1) * cutoff
+    lower = int(np.floor(index))
+    upper = min(lower + 1, window - 1)
+    weight = index - lower
+    (lower, _), (upper, _) = _rolling_select(R, window, lower, upper)
+    return _rolling_like(returns, lower + (upper - lower) * weight,
+                         window, gaps)
+
+
+def rolling_conditional_value_at_risk(returns, window, cutoff=0.05):
+    """Compute rolling Conditional value at risk (CVaR) of a returns
+    stream, as sums of the lowest returns of a wavelet matrix,
+    in O(T log T).
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+    window : int
+        Number of periods of each window.
+    cutoff : float, optional
+        Decimal representing the percentage cutoff for the bottom percentile of returns.
+
+    Returns
+    -------
+    CVaR : np.ndarray | pd.Series | pd.DataFrame
+        The CVaR value over the trailing window.
+    """
+    _validate_cutoff(cutoff)
+    R, gaps = _rolling(returns, window)
+    # number of lowest returns, as `conditional_value_at_risk`
+    m = int((window - 1) * cutoff) + 1
+    (values, tail), = _rolling_select(R, window, m - 1)
+    return _rolling_like(returns, (tail + values) / m, window, gaps)
+
+
+def rolling_drawdown(returns, window):
+    """Computes rolling Drawdown given simple returns, from the peak
+    of cumulative returns over the trailing window, in O(T).
+
+    Parameters
+    ----------
+    returns : np.ndarray | pd.Series | pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+    window : int
+        Number of periods of each window.
+
+    Returns
+    -------
+    drawdown : np.ndarray | pd.Series | pd.DataFrame
+        Drawdown of strategy over the trailing window.
+    """
+    R, gaps = _rolling(returns, window)
+    T, K = R.shape
+    _cum_returns = np.cumprod(R + 1, axis=0) - 1
+    # sliding maximum, van Herk/Gil-Werman: maxima of blocks of `window`
+    # dates from their start & from their end, any window spans two
+    num_blocks = -(-T // window)
+    blocks = np.full((num_blocks * window, K), -np.inf)
+    blocks[:T] = _cum_returns
+    blocks = blocks.reshape(num_blocks, window, K)
+    from_start = np.maximum.accumulate(blocks, axis=1).reshape(-1, K)
+    from_end = np.maximum.accumulate(
+        blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, K)
+    peak = np.maximum(from_end[:max(T - window + 1, 0)],
+                      from_start[window - 1:T])
+    return _rolling_like(
+        returns, peak - _cum_returns[window - 1:], window, gaps)
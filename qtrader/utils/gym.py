@@ -40,9 +40,12 @@ def run(env: Env, agent,
     Parameters
     ----------
     env: gym.Env
-        OpenAI Gym compatible environment
+        OpenAI Gym compatible environment,
+        or vectorized `qtrader.envs.VecEnv`
     agent: qtrader.agent.base.Agent
-        Agent to interact with the environment
+        Agent to interact with the environment, acting on & observing
+        whole observations, e.g. dicts of prices & returns of
+        `qtrader.envs`, rows or (window, M) views if windowed
     num_episodes: int
         Number of episodes to run
     record: bool
@@ -94,7 +97,7 @@ def run(env: Env, agent,
         # agent closure: beginning of episode
         agent.begin_episode(ob)
         # interaction loop
-        while (not done) and (j < env._max_episode_steps):
+        while (not np.all(done)) and (j < env._max_episode_steps):
             # agent closure: determine action
             action = agent.act(ob)
             # class 1: trading environments
@@ -124,6 +127,8 @@ def run(env: Env, agent,
     for e in range(num_episodes):
         # run episode
         R, A = _run()
+        # cumulative reward, averaged over vectorized episodes
+        cum_reward = np.mean(np.sum(R, axis=0))
         # episode-wise records
         if record:
             # store rewards
@@ -132,15 +137,15 @@ def run(env: Env, agent,
             actions.append(A)
         # log cumulative rewards
         if log:
-            print('episode: %4d, cumulative reward: %+.5f' % (e, sum(R)))
-        if sum(R) > _best_reward:
+            print('episode: %4d, cumulative reward: %+.5f' % (e, cum_reward))
+        if cum_reward > _best_reward:
             # try to delete previously best model
             try:
                 os.remove('tmp/models/%s/%f.h5' % (agent.name, _best_reward))
             except:
                 pass
             # set best reward
-            _best_reward = sum(R)
+            _best_reward = cum_reward
             # store agent state
             if hasattr(agent, 'save'):
                 # create folder if not there
@@ -27,3 +27,46 @@ def softmax(x):
     """Compute softmax values for each sets of scores in x."""
     e_x = np.exp(x - np.max(x))
     return e_x / e_x.sum(axis=0)
+
+
+def simplex_projection(x, long_only=True, mask=None):
+    """Euclidean projection of rows of `x` onto the
+    (probability) simplex, in O(M log M) per row.
+
+    Parameters
+    ----------
+    x: numpy.ndarray
+        (..., M) vectors to project
+    long_only: bool, optional
+        Non-negativity constraint, otherwise
+        projection onto the budget hyperplane
+    mask: numpy.ndarray, optional
+        (..., M) boolean mask of entries allowed to be
+        non-zero, e.g. available assets
+
+    Returns
+    -------
+    w: numpy.ndarray
+        (..., M) vectors summing to one
+    """
+    x = np.asarray(x, dtype=float)
+    M = x.shape[-1]
+    if mask is not None:
+        mask = np.broadcast_to(mask, x.shape)
+        if not long_only:
+            x = np.where(mask, x, 0.0)
+            M = mask.sum(axis=-1, keepdims=True)
+            return np.where(
+                mask, x + (1.0 - x.sum(axis=-1, keepdims=True)) / M, 0.0)
+        # masked entries sorted last, never positive
+        x = np.where(mask, x, -np.inf)
+    elif not long_only:
+        return x + (1.0 - x.sum(axis=-1, keepdims=True)) / M
+    # sort in descending order
+    u = -np.sort(-x, axis=-1)
+    css = np.cumsum(u, axis=-1) - 1.0
+    k = np.arange(1, M + 1)
+    # number of positive entries of projection
+    rho = np.sum(u * k > css, axis=-1, keepdims=True)
+    theta = np.take_along_axis(css, rho - 1, axis=-1) / rho
+    return np.maximum(x - theta, 0.0)
@@ -0,0 +1,384 @@
+import math
+
+import numpy as np
+
+from abc import abstractmethod
+
+from qtrader.utils.numpy import eps
+from qtrader.utils.econometric import _skewness, _kurtosis
+
+
+class Estimator:
+    """Streaming estimator of a `qtrader.utils.econometric` metric,
+    updated in O(1) per return, with bounded memory.
+
+    Returns are floats, or (K,) arrays of `K` strategies for
+    the estimators broadcasting over them.
+
+    Attributes
+    ----------
+    count: int | numpy.ndarray
+        Number of updates, or (K,) per strategy
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    @abstractmethod
+    def update(self, r):
+        """Update estimate with return `r`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def value(self):
+        """Current estimate."""
+        raise NotImplementedError
+
+
+class Moments(Estimator):
+    """Running mean and sum of squared deviations of returns,
+    Welford's algorithm, with (K,) counts for strategies
+    starting at different times.
+
+    Attributes
+    ----------
+    mean: float | numpy.ndarray
+        Mean of returns
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.mean = self._m2 = 0.0
+
+    def update(self, r):
+        """Update moments with return `r`."""
+        self.count = self.count + 1
+        delta = r - self.mean
+        self.mean = self.mean + delta / self.count
+        self._m2 = self._m2 + delta * (r - self.mean)
+
+    @property
+    def std(self):
+        """Standard deviation of returns, unbiased."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 1,
+                            np.sqrt(self._m2 / (self.count - 1)),
+                            np.nan)[()]
+
+    @property
+    def sharpe_ratio(self):
+        """Sharpe ratio of returns."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.sqrt(self.count) * self.mean /
+                    (np.sqrt(self._m2 / self.count) + eps))[()]
+
+    def value(self):
+        """Mean of returns, as `econometric.mean_returns`."""
+        return self.mean
+
+
+class Mean(Moments):
+    """Running mean of returns, see `econometric.mean_returns`."""
+
+
+class Std(Moments):
+    """Running standard deviation of returns,
+    see `econometric.std_returns`."""
+
+    def value(self):
+        """Standard deviation of returns, unbiased."""
+        return self.std
+
+
+class SharpeRatio(Moments):
+    """Running Sharpe ratio of returns,
+    see `econometric.sharpe_ratio`."""
+
+    def value(self):
+        """Sharpe ratio of returns."""
+        return self.sharpe_ratio
+
+
+class HigherMoments(Moments):
+    """Running mean and central moments of returns,
+    Welford's algorithm extended to the 4th moment."""
+
+    def __init__(self):
+        super().__init__()
+        self._m3 = self._m4 = 0.0
+
+    def update(self, r):
+        """Update moments with return `r`."""
+        n = self.count = self.count + 1
+        delta = r - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n ** 2
+        term = delta * delta_n * (n - 1)
+        self.mean = self.mean + delta_n
+        self._m4 = self._m4 + term * delta_n2 * (n * n - 3 * n + 3) + \
+            6 * delta_n2 * self._m2 - 4 * delta_n * self._m3
+        self._m3 = self._m3 + term * delta_n * (n - 2) - \
+            3 * delta_n * self._m2
+        self._m2 = self._m2 + term
+
+
+class Skewness(HigherMoments):
+    """Running skewness of returns, see `econometric.skewness`."""
+
+    def value(self):
+        """Bias-corrected skewness of returns."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _skewness(self.count, self._m2, self._m3)[()]
+
+
+class Kurtosis(HigherMoments):
+    """Running excess kurtosis of returns, see `econometric.kurtosis`."""
+
+    def value(self):
+        """Bias-corrected excess kurtosis of returns."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _kurtosis(self.count, self._m2, self._m4)[()]
+
+
+class MaxDrawdown(Estimator):
+    """Running max drawdown of returns, see `econometric.max_drawdown`,
+    peaking from the first return, or from the initial wealth level if
+    `initial`, as `econometric.max_drawdown` of records of episodes,
+    which start from a date of zero return.
+
+    Attributes
+    ----------
+    wealth: float | numpy.ndarray
+        Wealth level, from 1
+    peak: float | numpy.ndarray
+        Running maximum of wealth level
+    drawdown: float | numpy.ndarray
+        Drawdown, difference between peak and wealth level
+    max_drawdown: float | numpy.ndarray
+        Running maximum of drawdown
+    """
+
+    def __init__(self, initial: bool = False):
+        """Constructs a `MaxDrawdown` object.
+
+        Parameters
+        ----------
+        initial: bool, optional
+            Initial wealth level as the first peak
+        """
+        super().__init__()
+        self.wealth = 1.0
+        self.drawdown = self.max_drawdown = 0.0
+        self.peak = 1.0 if initial else -np.inf
+
+    def update(self, r):
+        """Update drawdown with return `r`."""
+        self.count = self.count + 1
+        self.wealth = self.wealth * (1 + r)
+        self.peak = np.maximum(self.peak, self.wealth)
+        self.drawdown = self.peak - self.wealth
+        self.max_drawdown = np.maximum(self.max_drawdown, self.drawdown)
+
+    @property
+    def cum_returns(self):
+        """Cumulative returns."""
+        return self.wealth - 1
+
+    def value(self):
+        """Max drawdown of returns."""
+        return self.max_drawdown
+
+
+class DifferentialSharpeRatio(Estimator):
+    """Differential Sharpe ratio of last returns, Moody & Saffell
+    (1998), against exponential moving moments of returns.
+
+    Attributes
+    ----------
+    eta: float
+        Adaptation rate of the exponential moving moments
+    """
+
+    def __init__(self, eta: float = 0.01):
+        super().__init__()
+        self.eta = eta
+        self._A = self._B = self.differential_sharpe_ratio = 0.0
+
+    def update(self, r):
+        """Differential Sharpe ratio of return `r`,
+        before updating the moving moments."""
+        self.count = self.count + 1
+        delta_A = r - self._A
+        delta_B = r ** 2 - self._B
+        variance = self._B - self._A ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.differential_sharpe_ratio = np.where(
+                variance > eps,
+                (self._B * delta_A - 0.5 * self._A * delta_B) /
+                np.abs(variance) ** 1.5,
+                0.0)[()]
+        self._A = self._A + self.eta * delta_A
+        self._B = self._B + self.eta * delta_B
+
+    def value(self):
+        """Differential Sharpe ratio of last returns."""
+        return self.differential_sharpe_ratio
+
+
+class HitRatio(Estimator):
+    """Running hit ratio of returns, see `econometric.hit_ratio`."""
+
+    def __init__(self):
+        super().__init__()
+        self.wins = 0
+
+    def update(self, r):
+        """Count return `r`, a hit if positive."""
+        self.count += 1
+        self.wins = self.wins + (np.asarray(r) > 0)
+
+    def value(self):
+        """Hit ratio of returns."""
+        return self.wins / self.count if self.count > 0 else np.nan
+
+
+class WinLoss(Estimator):
+    """Running average win & average loss of returns,
+    see `econometric.awal` & `econometric.appt`.
+
+    Attributes
+    ----------
+    wins: int | numpy.ndarray
+        Number of positive returns
+    losses: int | numpy.ndarray
+        Number of negative returns
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.wins = self.losses = 0
+        self._win = self._loss = 0.0
+
+    def update(self, r):
+        """Update averages with return `r`."""
+        self.count += 1
+        win, loss = np.asarray(r) > 0, np.asarray(r) < 0
+        self.wins = self.wins + win
+        self.losses = self.losses + loss
+        self._win = self._win + np.where(win, r, 0.0)
+        self._loss = self._loss + np.where(loss, r, 0.0)
+
+    @property
+    def average_win(self):
+        """Average positive return."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self._win / self.wins)[()]
+
+    @property
+    def average_loss(self):
+        """Average negative return."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self._loss / self.losses)[()]
+
+    @property
+    def appt(self):
+        """Average profitability per trade."""
+        return (self.wins * self.average_win -
+                self.losses * self.average_loss) / self.count
+
+    def value(self):
+        """Average win to average loss ratio."""
+        return np.abs((self.average_win + eps) / (self.average_loss + eps))
+
+
+class QuantileSketch(Estimator):
+    """Bounded-memory sketch of the distribution of returns, for
+    value at risk & conditional value at risk, see
+    `econometric.value_at_risk` & `econometric.conditional_value_at_risk`.
+
+    Returns are counted in logarithmic bins of their magnitude, per sign,
+    with relative accuracy `alpha`, Masson et al. (2019) DDSketch, and
+    magnitudes below `min_value` in a zero bin, bounding the bins by
+    `2 log(max |r| / min_value) / log((1 + alpha) / (1 - alpha))`.
+    Bins also sum their returns, for exact tail means of whole bins.
+    """
+
+    def __init__(self, cutoff: float = 0.05, alpha: float = 0.005,
+                 min_value: float = 1e-8):
+        """Constructs a `QuantileSketch` object.
+
+        Parameters
+        ----------
+        cutoff: float, optional
+            Decimal representing the percentage cutoff
+            for the bottom percentile of returns.
+        alpha: float, optional
+            Relative accuracy of quantiles.
+        min_value: float, optional
+            Smallest magnitude of returns distinguished from zero.
+        """
+        super().__init__()
+        self.cutoff = cutoff
+        self.alpha = alpha
+        self.min_value = min_value
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+        # bins per sign, key to [count, sum]
+        self._positive = {}
+        self._negative = {}
+        self._zero = [0, 0.0]
+
+    def update(self, r: float):
+        """Count return `r` in its bin."""
+        self.count += 1
+        if abs(r) < self.min_value:
+            counts = self._zero
+        else:
+            store = self._positive if r > 0 else self._negative
+            key = math.ceil(math.log(abs(r)) / self._log_gamma)
+            counts = store.setdefault(key, [0, 0.0])
+        counts[0] += 1
+        counts[1] += r
+
+    def _bins(self):
+        """Ascending bins, as (count, sum, representative return)."""
+        gamma = math.exp(self._log_gamma)
+        for key in sorted(self._negative, reverse=True):
+            count, total = self._negative[key]
+            yield count, total, -2 * gamma ** key / (gamma + 1)
+        if self._zero[0] > 0:
+            yield self._zero[0], self._zero[1], 0.0
+        for key in sorted(self._positive):
+            count, total = self._positive[key]
+            yield count, total, 2 * gamma ** key / (gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """Quantile `q` of returns, within relative accuracy `alpha`."""
+        if self.count == 0:
+            return np.nan
+        rank = int((self.count - 1) * q)
+        seen = 0
+        for count, _, value in self._bins():
+            seen += count
+            if seen > rank:
+                return value
+        return value
+
+    def value(self) -> float:
+        """Value at risk of returns, quantile `cutoff`."""
+        return self.quantile(self.cutoff)
+
+    def conditional_value(self) -> float:
+        """Conditional value at risk of returns, mean of
+        the lowest `cutoff` percentile of returns."""
+        if self.count == 0:
+            return np.nan
+        remaining = num = int((self.count - 1) * self.cutoff) + 1
+        tail = 0.0
+        for count, total, _ in self._bins():
+            if count >= remaining:
+                # partial bin, at its mean
+                tail += remaining * total / count
+                break
+            tail += total
+            remaining -= count
+        return tail / num
@@ -1,8 +1,10 @@
 import numpy as np
 import pandas as pd
 
+import typing
 
-def clean(df: pd.DataFrame) -> pd.DataFrame:
+
+def clean(df: pd.DataFrame, how: str = 'any') -> pd.DataFrame:
     """Clean `pandas.DataFrame` from
     missing entries.
 
@@ -10,6 +12,8 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
     ----------
     df: pandas.DataFrame
         Table to be cleaned.
+    how: str, optional
+        Drop rows with 'any' or 'all' entries missing.
     Returns
     -------
     clean_df: pandas.DataFrame
@@ -18,7 +22,35 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
     # remove infinities
     df = df.replace([np.inf, -np.inf], np.nan)
     # drop NaN values
-    return df.dropna()
+    return df.dropna(how=how)
+
+
+def availability(df: pd.DataFrame) -> typing.Tuple[np.ndarray, pd.DataFrame]:
+    """Validity bitmap & listing intervals of ragged table,
+    e.g. prices of a survivorship-free universe.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        Table with missing entries before listing & after delisting.
+
+    Returns
+    -------
+    valid: numpy.ndarray
+        (T, M) boolean bitmap of finite entries.
+    intervals: pandas.DataFrame
+        First ('listed') and last ('delisted') dates of finite entries,
+        per column, `NaT` for columns without any.
+    """
+    valid = np.isfinite(df.values)
+    any_valid = valid.any(axis=0)
+    first = np.argmax(valid, axis=0)
+    last = len(df) - 1 - np.argmax(valid[::-1], axis=0)
+    intervals = pd.DataFrame({'listed': df.index[first],
+                              'delisted': df.index[last]},
+                             index=df.columns)
+    intervals[~any_valid] = pd.NaT
+    return valid, intervals
 
 
 def align(target, source):
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 
+import qtrader.framework
 from qtrader.utils.numpy import eps
 
 
@@ -28,7 +29,7 @@ def rolling1d(series, window):
     return np.lib.stride_tricks.as_strided(series, shape=shape, strides=strides)
 
 
-def rolling2d(array, window):
+def rolling2d(array, window, dtype=None):
     """Rolling window for 2D array.
 
     Parameters
@@ -37,6 +38,8 @@ def rolling2d(array, window):
         Sequential 2D data
     window: int
         Window size
+    dtype: str | numpy.dtype, optional
+        Output precision, defaults to `qtrader.framework.DTYPE`
 
     Returns
     -------
@@ -47,7 +50,8 @@ def rolling2d(array, window):
         array = np.array(array)
     if len(array.shape) != 2:
         raise ValueError("2D array expected")
-    out = np.empty((array.shape[0] - window + 1, window, array.shape[1]))
+    out = np.empty((array.shape[0] - window + 1, window, array.shape[1]),
+                   dtype=dtype or qtrader.framework.DTYPE)
     if isinstance(array, np.ndarray):
         for i, col in enumerate(array.T):
             out[:, :, i] = rolling1d(col, window)
@@ -57,6 +61,30 @@ def rolling2d(array, window):
     return out
 
 
+def rolling_view(array, window):
+    """Read-only rolling window view of 2D array,
+    without copying data.
+
+    Parameters
+    ----------
+    array: numpy.ndarray
+        Sequential 2D data
+    window: int
+        Window size
+
+    Returns
+    -------
+    tensor: numpy.ndarray
+        Tensor of rolling windowed views, (N - window + 1, window, M)
+    """
+    if array.ndim != 2:
+        raise ValueError("2D array expected")
+    shape = (max(array.shape[0] - window + 1, 0), window, array.shape[1])
+    strides = (array.strides[0],) + array.strides
+    return np.lib.stride_tricks.as_strided(array, shape=shape,
+                                           strides=strides, writeable=False)
+
+
 def Xy(series, window, out_shape=1):
     """Time series to supervised data.
 
@@ -1,45 +1,58 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
 import qtrader
 
+# report labels of `qtrader.utils.econometric.metrics`
+_REPORT = {
+    'Mean Returns': 'mean_returns',
+    'Cumulative Returns': 'cum_returns',
+    'Volatility': 'std_returns',
+    'Sharpe Ratio': 'sharpe_ratio',
+    'Max Drawdown': 'max_drawdown',
+    'Average Drawdown Time': 'average_drawdown_time',
+    'Skewness': 'skewness',
+    'Kurtosis': 'kurtosis',
+    'Tail Ratio': 'tail_ratio',
+    'Value at Risk': 'value_at_risk',
+    'Conditional Value at Risk': 'conditional_value_at_risk',
+    'Hit Ratio': 'hit_ratio',
+    'Average Win to Average Loss': 'awal',
+    'Average Profitability Per Trade': 'appt'
+}
+
 
 def stats(returns):
-    """Generate statistics report for strategy.
+    """Generate statistics report for strategy, or strategies,
+    see `qtrader.utils.econometric.metrics`.
 
     Parameters
     ----------
-    prices: pandas.DataFrame
-        Prices of asset universe.
-    returns: pandas.Series
-        Realised returns of strategy.
-    weights: pandas.DataFrame
-        Portfolio weights of strategy.
+    returns: pandas.Series | pandas.DataFrame | numpy.ndarray
+        Realised returns of strategy, or (T, K) of `K` strategies.
 
     Returns
     -------
-    table: pd.Series
-        Strategy report.
+    table: pd.Series | pd.DataFrame
+        Strategy report, or (K, metrics) report of strategies.
     """
-    report = {
-        'Mean Returns': qtrader.utils.econometric.mean_returns(returns),
-        'Cumulative Returns': qtrader.utils.econometric.cum_returns(returns).iloc[-1],
-        'Volatility': qtrader.utils.econometric.std_returns(returns),
-        'Sharpe Ratio': qtrader.utils.econometric.sharpe_ratio(returns),
-        'Max Drawdown': qtrader.utils.econometric.max_drawdown(returns).iloc[-1],
-        'Average Drawdown Time': qtrader.utils.econometric.average_drawdown_time(returns).days,
-        'Skewness': qtrader.utils.econometric.skewness(returns),
-        'Kurtosis': qtrader.utils.econometric.kurtosis(returns),
-        'Tail Ratio': qtrader.utils.econometric.tail_ratio(returns),
-        'Value at Risk': qtrader.utils.econometric.value_at_risk(returns),
-        'Conditional Value at Risk': qtrader.utils.econometric.conditional_value_at_risk(returns),
-        'Hit Ratio': qtrader.utils.econometric.hit_ratio(returns),
-        'Average Win to Average Loss': qtrader.utils.econometric.awal(returns),
-        'Average Profitability Per Trade': qtrader.utils.econometric.appt(returns)
-    }
+    values = np.asarray(returns)
+    index = getattr(returns, 'index', None)
+    dates = index if isinstance(index, pd.DatetimeIndex) else None
+    metrics = qtrader.utils.econometric.metrics(values, dates)
+    report = {label: metrics[key] for label, key in _REPORT.items()}
+    if values.ndim == 2:
+        strategies = returns.columns \
+            if isinstance(returns, pd.DataFrame) else \
+            ['strategy_%d' % k for k in range(values.shape[1])]
+        return pd.DataFrame(report, index=strategies, dtype=float)
+    # whole days, as `datetime.timedelta.days`
+    if np.isfinite(report['Average Drawdown Time']):
+        report['Average Drawdown Time'] = int(report['Average Drawdown Time'])
     table = pd.Series(
         report,
-        name=(returns.name or 'Strategy'),
+        name=(getattr(returns, 'name', None) or 'Strategy'),
         dtype=object
     )
     return table
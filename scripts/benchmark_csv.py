@@ -0,0 +1,65 @@
+import qtrader
+
+import os
+import time
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# universe size
+NUM_ASSETS = 500
+# 20 years of business days
+NUM_DATES = 20 * 261
+# requested tickers
+TICKERS = ['A007', 'A123', 'A256', 'A499']
+
+# synthetic daily prices
+np.random.seed(13)
+dates = pd.date_range('1998-01-01', periods=NUM_DATES, freq='B')
+prices = pd.DataFrame(
+    np.exp(np.cumsum(np.random.normal(0, 0.01, (NUM_DATES, NUM_ASSETS)),
+                     axis=0)),
+    index=dates, columns=['A%03d' % i for i in range(NUM_ASSETS)])
+
+
+def legacy(path):
+    """Parse every column, then select."""
+    df = pd.read_csv(path, index_col='Date',
+                     parse_dates=True).sort_index(ascending=True)
+    return df[[ticker for ticker in TICKERS if ticker in df.columns]]
+
+
+def measure(load, path):
+    """Wall time & peak traced memory of `load`."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = load(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak / 2 ** 20
+
+
+with tempfile.TemporaryDirectory() as root:
+    path = os.path.join(root, 'prices.csv')
+    prices.to_csv(path, index_label='Date')
+    Finance = qtrader.envs.data_loader.Finance
+    # before: parse all columns
+    expected, before, before_mem = measure(legacy, path)
+    # after: header, then typed projection of requested columns
+    df, after, after_mem = measure(
+        lambda path: Finance.Prices(TICKERS, csv=path), path)
+    # after: chunked reading
+    _, chunked, chunked_mem = measure(
+        lambda path: Finance.Prices(TICKERS, csv=path, chunksize=1000), path)
+    np.testing.assert_allclose(df.values, expected.values)
+
+print('csv: %d tickers x %d dates, %d requested' %
+      (NUM_ASSETS, NUM_DATES, len(TICKERS)))
+print('before:  %8.3f sec %8.1f MiB' % (before, before_mem))
+print('after:   %8.3f sec %8.1f MiB' % (after, after_mem))
+print('chunked: %8.3f sec %8.1f MiB' % (chunked, chunked_mem))
+print('speedup: %.1fx, memory: %.1fx less' %
+      (before / after, before_mem / after_mem))
@@ -0,0 +1,44 @@
+import qtrader
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# 20 years of business days
+NUM_DATES = 20 * 261
+
+# synthetic daily returns
+np.random.seed(13)
+dates = pd.date_range('1998-01-01', periods=NUM_DATES, freq='B')
+returns = pd.Series(np.random.standard_t(4, NUM_DATES) * 0.01 + 0.0003,
+                    index=dates, name='Strategy')
+
+
+def legacy(returns):
+    """Maximum over the prefix of every date."""
+    _cum_returns = qtrader.utils.econometric.cum_returns(returns)
+    drawdown = pd.Series(np.nan, index=_cum_returns.index, name='drawdown')
+    for T in _cum_returns.index[1:]:
+        X_t = _cum_returns.loc[:T]
+        X_T = _cum_returns.loc[T]
+        drawdown.loc[T] = max([0, X_t.max() - X_T])
+    return drawdown
+
+
+# before: quadratic drawdown
+start = time.perf_counter()
+expected = legacy(returns)
+before = time.perf_counter() - start
+
+# after: linear drawdown & episodes
+start = time.perf_counter()
+drawdown = qtrader.utils.econometric._drawdown(returns)
+episodes = qtrader.utils.econometric.drawdown_episodes(returns)
+after = time.perf_counter() - start
+
+np.testing.assert_allclose(drawdown.values[1:], expected.values[1:])
+print('returns: %d dates, %d episodes' % (NUM_DATES, len(episodes)))
+print('before: %8.2f ms' % (1e3 * before))
+print('after:  %8.2f ms' % (1e3 * after))
+print('speedup: %.1fx' % (before / after))
@@ -0,0 +1,48 @@
+import qtrader
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# 20 years of business days
+NUM_DATES = 20 * 261
+# number of strategies
+NUM_STRATEGIES = 10
+# one year window
+WINDOW = 261
+
+# synthetic daily returns
+np.random.seed(13)
+dates = pd.date_range('1998-01-01', periods=NUM_DATES, freq='B')
+returns = pd.DataFrame(
+    np.random.standard_t(4, (NUM_DATES, NUM_STRATEGIES)) * 0.01 + 0.0003,
+    index=dates, columns=['S%d' % k for k in range(NUM_STRATEGIES)])
+
+econometric = qtrader.utils.econometric
+metrics = {
+    'sharpe_ratio': (econometric.sharpe_ratio,
+                     econometric.rolling_sharpe_ratio),
+    'value_at_risk': (econometric.value_at_risk,
+                      econometric.rolling_value_at_risk),
+    'conditional_value_at_risk': (
+        econometric.conditional_value_at_risk,
+        econometric.rolling_conditional_value_at_risk),
+}
+
+print('returns: %d dates x %d strategies, window %d' %
+      (NUM_DATES, NUM_STRATEGIES, WINDOW))
+for name, (function, rolling) in metrics.items():
+    # before: metric of every window slice
+    start = time.perf_counter()
+    expected = np.array([function(returns.values[t - WINDOW + 1:t + 1])
+                         for t in range(WINDOW - 1, NUM_DATES)])
+    before = time.perf_counter() - start
+    # after: rolling metric
+    start = time.perf_counter()
+    table = rolling(returns, WINDOW)
+    after = time.perf_counter() - start
+    np.testing.assert_allclose(table.values[WINDOW - 1:], expected,
+                               rtol=1e-9, atol=1e-15)
+    print('%s: before %8.2f ms, after %8.2f ms, speedup %.1fx' %
+          (name, 1e3 * before, 1e3 * after, before / after))
@@ -0,0 +1,85 @@
+import qtrader
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# 100 years of business days
+NUM_DATES = 100 * 261
+# number of timed reports
+NUM_REPEATS = 5
+
+# synthetic daily returns
+np.random.seed(13)
+dates = pd.date_range('1918-01-01', periods=NUM_DATES, freq='B')
+returns = pd.Series(np.random.standard_t(4, NUM_DATES) * 0.01 + 0.0003,
+                    index=dates, name='Strategy')
+
+
+def legacy(returns):
+    """One `econometric` function call per statistic."""
+    econometric = qtrader.utils.econometric
+    return pd.Series({
+        'Mean Returns': econometric.mean_returns(returns),
+        'Cumulative Returns': econometric.cum_returns(returns).iloc[-1],
+        'Volatility': econometric.std_returns(returns),
+        'Sharpe Ratio': econometric.sharpe_ratio(returns),
+        'Max Drawdown': econometric.max_drawdown(returns).iloc[-1],
+        'Average Drawdown Time':
+            econometric.average_drawdown_time(returns).days,
+        'Skewness': econometric.skewness(returns),
+        'Kurtosis': econometric.kurtosis(returns),
+        'Tail Ratio': econometric.tail_ratio(returns),
+        'Value at Risk': econometric.value_at_risk(returns),
+        'Conditional Value at Risk':
+            econometric.conditional_value_at_risk(returns),
+        'Hit Ratio': econometric.hit_ratio(returns),
+        'Average Win to Average Loss': econometric.awal(returns),
+        'Average Profitability Per Trade': econometric.appt(returns)
+    }, name=returns.name, dtype=object)
+
+
+# before: separate functions, rescanning returns
+start = time.perf_counter()
+for _ in range(NUM_REPEATS):
+    expected = legacy(returns)
+before = (time.perf_counter() - start) / NUM_REPEATS
+
+# after: fused single-pass metrics
+start = time.perf_counter()
+for _ in range(NUM_REPEATS):
+    table = qtrader.utils.summary.stats(returns)
+after = (time.perf_counter() - start) / NUM_REPEATS
+
+np.testing.assert_allclose(table.values.astype(float),
+                           expected.values.astype(float), rtol=1e-9)
+print('returns: %d dates' % NUM_DATES)
+print('before: %8.2f ms/report' % (1e3 * before))
+print('after:  %8.2f ms/report' % (1e3 * after))
+print('speedup: %.1fx' % (before / after))
+
+# strategy matrix: 10 years of business days, per parameterisation
+NUM_STRATEGIES = 1000
+matrix = pd.DataFrame(
+    np.random.standard_t(4, (10 * 261, NUM_STRATEGIES)) * 0.01 + 0.0003,
+    index=dates[:10 * 261],
+    columns=['S%d' % k for k in range(NUM_STRATEGIES)])
+
+# before: one report per strategy
+start = time.perf_counter()
+expected = pd.DataFrame({strategy: qtrader.utils.summary.stats(
+    matrix[strategy]) for strategy in matrix}).T
+before = time.perf_counter() - start
+
+# after: column-wise (K, metrics) report
+start = time.perf_counter()
+table = qtrader.utils.summary.stats(matrix)
+after = time.perf_counter() - start
+
+np.testing.assert_allclose(table.values, expected.values.astype(float),
+                           rtol=1e-12)
+print('matrix: %d dates x %d strategies' % matrix.shape)
+print('before: %8.2f ms/report' % (1e3 * before))
+print('after:  %8.2f ms/report' % (1e3 * after))
+print('speedup: %.1fx' % (before / after))
@@ -0,0 +1,54 @@
+import qtrader
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# universe size
+NUM_ASSETS = 500
+# 20 years of business days
+NUM_DATES = 20 * 261
+# number of environment steps timed
+NUM_STEPS = 1000
+
+# synthetic daily prices
+np.random.seed(13)
+dates = pd.date_range('1998-01-01', periods=NUM_DATES, freq='B')
+prices = pd.DataFrame(
+    np.exp(np.cumsum(np.random.normal(0, 0.01, (NUM_DATES, NUM_ASSETS)),
+                     axis=0)),
+    index=dates, columns=['A%03d' % i for i in range(NUM_ASSETS)])
+
+env = qtrader.envs.TradingEnv(prices=prices, trading_period='B')
+agent = qtrader.agents.UniformAgent(env.action_space)
+env.register(agent)
+action = agent.act(None)
+steps = min(NUM_STEPS, env._max_episode_steps - 1)
+
+# before: per-step `pandas.DataFrame.loc` observations & records
+actions = pd.DataFrame(columns=env.universe, index=env.dates, dtype=float)
+rewards = pd.DataFrame(columns=env.universe, index=env.dates, dtype=float)
+env.reset()
+start = time.perf_counter()
+for _ in range(steps):
+    env._counter += 1
+    env._prices.loc[env.index, :]
+    env._returns.loc[env.index, :]
+    actions.loc[env.index] = action
+    rewards.loc[env.index] = env._returns.loc[env.index] * action
+    rewards.loc[env.index].sum()
+before = steps / (time.perf_counter() - start)
+
+# after: `BaseEnv.step` on array-backed records
+env.reset()
+start = time.perf_counter()
+for _ in range(steps):
+    env.step({agent.name: action})
+after = steps / (time.perf_counter() - start)
+
+print('universe: %d assets x %d dates, %d steps' %
+      (len(env.universe), len(env.dates), steps))
+print('before: %10.1f steps/sec' % before)
+print('after:  %10.1f steps/sec' % after)
+print('speedup: %.1fx' % (after / before))
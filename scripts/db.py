@@ -1,28 +1,18 @@
 import qtrader
 
-import os
-
 import pandas as pd
 
-# fetch data
-sp500, prices, returns = qtrader.envs.data_loader.Finance.SP500(
-    return_prices_returns=True)
-# make if not there 'db' folder
-if not os.path.exists('db'):
-    os.makedirs('db')
-# store data
-sp500.to_csv('db/sp500.csv')
-prices.to_csv('db/prices.csv')
-returns.to_csv('db/returns.csv')
-
-# remove from score
-del sp500
-del prices
-del returns
+# build database, resumable after failures
+report = qtrader.envs.data_loader.Finance.build('db')
+print('fetched %d, resumed %d of %d tickers in %.1fs (%.1f tickers/sec)' %
+      (report['fetched'], report['resumed'], report['tickers'],
+       report['seconds'], report['throughput']))
+if len(report['failures']) > 0:
+    print('failed: %s' % ', '.join(report['failures']))
 
 # read data
 sp500 = pd.read_csv('db/sp500.csv', index_col=0, header=0)
 prices = qtrader.envs.data_loader.Finance.Prices(
-    sp500.index.tolist(), csv='db/prices.csv')
+    sp500.index.tolist(), store='db/prices')
 returns = qtrader.envs.data_loader.Finance.Returns(
-    sp500.index.tolist(), csv='db/returns.csv')
+    sp500.index.tolist(), store='db/returns')
@@ -1,9 +1,13 @@
 import unittest
 
+import numpy as np
 import qtrader
+import qtrader.agents.var
 
 import gym
 
+from tests.envs import _prices
+
 CSV_PATH = 'db/prices.csv'
 
 
@@ -107,6 +111,38 @@ class TestAgents(unittest.TestCase):
         # expect risk aversion to outperform random
         return risk_aversion_cumsum > random_cumsum
 
+    def test__run_window(self):
+        """Test agents of `qtrader.utils.gym.run`,
+        with row & windowed observations."""
+        prices = _prices(num_dates=120)
+        for window in [None, 10]:
+            # risky assets, for a regular VAR model
+            env = qtrader.envs.TradingEnv(prices=prices, trading_period='B',
+                                          cash=False, window=window)
+            agents = [
+                qtrader.agents.QuadraticAgent(
+                    env.action_space, 'sharpe_ratio', 10, 0.5),
+                qtrader.agents.var.VARAgent(
+                    env._returns.iloc[1:60], max_order=2),
+                qtrader.agents.var.VARAgent(
+                    env._returns.iloc[1:60], max_order=2, policy='best')]
+            for agent in agents:
+                np.random.seed(13)
+                rewards, actions = qtrader.utils.gym.run(env, agent, 1)
+                self.assertEqual(len(rewards[0]), len(env.dates) - 1)
+                self.assertTrue(np.isfinite(rewards[0]).all())
+                # forecasts once the lookback is known
+                if isinstance(agent, qtrader.agents.var.VARAgent):
+                    k = agent.memory.maxlen
+                    forecast = agent.model.forecast(
+                        env._returns.values[-k - 1:-1], 1)[0]
+                    expected = np.eye(len(forecast))[np.argmax(forecast)] \
+                        if agent.policy == 'best' else \
+                        qtrader.utils.numpy.softmax(forecast)
+                    np.testing.assert_allclose(actions[0][-1], expected)
+                self.assertEqual(np.shape(actions[0][-1]),
+                                 (len(env.universe),))
+
 
 if __name__ == '__main__':
     unittest.main()
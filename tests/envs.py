@@ -1,11 +1,42 @@
 import unittest
+import tempfile
+import pickle
+import collections
+import multiprocessing
+import os
+
+from multiprocessing import shared_memory
 
 import numpy as np
+import pandas as pd
 import qtrader
 
 CSV_PATH = 'db/prices.csv'
 
 
+def _prices(num_dates=250, num_assets=4, seed=13):
+    """Synthetic daily prices table."""
+    rng = np.random.RandomState(seed)
+    index = pd.date_range('2010-01-01', periods=num_dates, freq='B')
+    columns = ['A%d' % i for i in range(num_assets)]
+    return pd.DataFrame(
+        np.exp(np.cumsum(rng.normal(0, 0.01, (num_dates, num_assets)),
+                         axis=0)),
+        index=index, columns=columns)
+
+
+def _checksum(descriptor):
+    """Checksum of prices & returns of a shared panel,
+    attached by an environment of a child process."""
+    env = qtrader.envs.TradingEnv(prices=descriptor)
+    panel = env._shared
+    checksum = float(np.nansum(env._prices_buffer) +
+                     np.nansum(env._returns_buffer))
+    del env
+    panel.close()
+    return checksum
+
+
 class TestEnvs(unittest.TestCase):
     """Test `qtrader.envs` module."""
 
@@ -26,6 +57,759 @@ class TestEnvs(unittest.TestCase):
         env.unregister(agent)
         return self.assertIsInstance(np.sum(rewards), float)
 
+    def test__BaseEnv_Record(self):
+        """Test `qtrader.envs.BaseEnv.Record` class."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        agent = qtrader.agents.UniformAgent(env.action_space)
+        env.register(agent)
+        ob = env.reset()
+        done = False
+        rewards = []
+        while not done:
+            ob, reward, done, _ = env.step({agent.name: agent.act(ob)})
+            rewards.append(reward[agent.name])
+        record = env.agents[agent.name]
+        # lazily built tables
+        self.assertEqual(record.actions.shape, (len(env.dates),
+                                                len(env.universe)))
+        self.assertEqual(record.actions.loc[env.dates[0], 'CASH'], 1.0)
+        # rewards match `pandas` computation
+        expected = (env._returns.iloc[1:] * agent.act(ob)).sum(axis=1)
+        np.testing.assert_allclose(rewards, expected.values)
+        np.testing.assert_allclose(
+            record.rewards.sum(axis=1).values[1:], expected.values)
+
+    def test__VecEnv(self):
+        """Test `qtrader.envs.VecEnv` class."""
+        envs = [qtrader.envs.TradingEnv(prices=_prices(seed=seed))
+                for seed in range(3)]
+        vec_env = qtrader.envs.VecEnv(envs)
+        ob = vec_env.reset()
+        self.assertEqual(ob['prices'].shape, (3, len(vec_env.universe)))
+        np.random.seed(13)
+        actions = np.stack([env.action_space.sample() for env in envs])
+        # reference rewards of independent environments
+        expected = []
+        for env in envs:
+            agent = qtrader.agents.RandomAgent(env.action_space)
+            env.register(agent)
+            env.reset()
+            _, reward, _, _ = env.step({agent.name: actions[len(expected)]})
+            expected.append(reward[agent.name])
+        _, reward, done, _ = vec_env.step(actions)
+        np.testing.assert_allclose(reward, expected)
+        self.assertEqual(done.shape, (3,))
+        # invalid budget raises
+        with self.assertRaises(ValueError):
+            vec_env.step(actions * 2)
+        # automatic reset of finished episodes
+        vec_env.reset()
+        for t in range(1, vec_env._max_episode_steps):
+            ob, _, done, info = vec_env.step(actions)
+        self.assertTrue(done.all())
+        np.testing.assert_array_equal(info['final_observation']['prices'],
+                                      vec_env._prices_buffer[-1])
+        np.testing.assert_array_equal(ob['prices'], vec_env._prices_buffer[0])
+        _, _, done, _ = vec_env.step(actions)
+        self.assertFalse(done.any())
+        # spaces of a single episode, not shared
+        self.assertIsNot(vec_env.single_action_space, envs[0].action_space)
+        self.assertEqual(vec_env.single_observation_space.shape,
+                         (len(vec_env.universe),))
+        # unsupported options
+        for kwargs in [{'window': 5}, {'ragged': True}, {'repair': True},
+                       {'reward': 'differential_sharpe_ratio'}]:
+            with self.assertRaises(ValueError):
+                qtrader.envs.VecEnv([qtrader.envs.TradingEnv(
+                    prices=_prices(), **kwargs)])
+        # `run` compatibility
+        agent = qtrader.agents.UniformAgent(vec_env.single_action_space)
+        rewards, _ = qtrader.utils.gym.run(vec_env, agent, 1)
+        self.assertEqual(len(rewards[0]), vec_env._max_episode_steps - 1)
+
+    def test__BaseEnv_evaluate(self):
+        """Test `qtrader.envs.BaseEnv.evaluate` method."""
+        env = qtrader.envs.TradingEnv(prices=_prices())
+        np.random.seed(13)
+        weights = np.stack([[env.action_space.sample()
+                             for _ in env.dates] for _ in range(2)])
+        records = env.evaluate(weights, names=['a', 'b'])
+        # step-by-step execution
+        agent = qtrader.agents.RandomAgent(env.action_space)
+        env.register(agent)
+        env.reset()
+        done = False
+        rewards = [0.0]
+        while not done:
+            _, reward, done, _ = env.step(
+                {agent.name: weights[1, env._counter + 1]})
+            rewards.append(reward[agent.name])
+        record = env.agents[agent.name]
+        np.testing.assert_array_equal(records['b']._actions, record._actions)
+        np.testing.assert_array_equal(records['b']._rewards, record._rewards)
+        np.testing.assert_array_equal(
+            records['b']._rewards.sum(axis=1), rewards)
+        np.testing.assert_array_equal(records['b'].pnl, record.pnl)
+        self.assertEqual(list(env.summary(records).columns), ['a', 'b'])
+        # tables aligned by labels
+        table = pd.DataFrame(weights[1], index=env.dates,
+                             columns=env.universe)
+        shuffled = table.iloc[::-1, ::-1]
+        np.testing.assert_array_equal(
+            env.evaluate(shuffled)['strategy_0']._rewards, record._rewards)
+        with self.assertRaises(ValueError):
+            env.evaluate(table.rename(columns={'CASH': 'USD'}))
+        with self.assertRaises(ValueError):
+            env.evaluate(table.set_axis(env.dates + pd.Timedelta(days=1)))
+
+    def test__BaseEnv_window(self):
+        """Test `qtrader.envs.BaseEnv` windowed observations."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), window=5)
+        agent = qtrader.agents.QuadraticAgent(
+            env.action_space, 'sharpe_ratio', 5, 0.5)
+        env.register(agent)
+        ob = env.reset()
+        self.assertEqual(ob['prices'].shape, env.observation_space.shape)
+        # flat history before the first date
+        np.testing.assert_array_equal(ob['prices'][0], ob['prices'][-1])
+        done = False
+        while not done:
+            action = agent.act(ob['prices'])
+            ob, _, done, _ = env.step({agent.name: action})
+            # read-only views, of the prices buffer after the first window
+            self.assertFalse(ob['prices'].flags.writeable)
+            self.assertEqual(
+                np.shares_memory(ob['prices'], env._prices_buffer),
+                env._counter >= 4)
+            np.testing.assert_array_equal(
+                ob['prices'][-1], env._prices.iloc[env._counter].values)
+            if env._counter >= 5:
+                np.testing.assert_array_equal(
+                    ob['returns'], env._returns.iloc[env._counter - 4:
+                                                     env._counter + 1].values)
+            if env._counter == 10:
+                break
+
+    def test__BaseEnv_reset(self):
+        """Test `qtrader.envs.BaseEnv.reset` sub-episodes."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        agent = qtrader.agents.UniformAgent(env.action_space)
+        env.register(agent)
+        np.random.seed(13)
+        for _ in range(5):
+            ob = env.reset(length=20)
+            self.assertEqual(ob['prices'].name, env.episode[0])
+            done, steps = False, 0
+            while not done:
+                ob, _, done, _ = env.step({agent.name: agent.act(ob)})
+                steps += 1
+            self.assertEqual(steps, 19)
+            self.assertEqual(ob['prices'].name, env.episode[-1])
+            self.assertEqual(len(env.agents[agent.name].actions), 20)
+        # explicit start
+        env.reset(start=3, length=10)
+        self.assertEqual(env.index, env.dates[3])
+        with self.assertRaises(ValueError):
+            env.reset(start=len(env.dates) - 5, length=10)
+
+    def test__BaseEnv_fork(self):
+        """Test `qtrader.envs.BaseEnv.fork` & `restore` methods."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        agent = qtrader.agents.RandomAgent(env.action_space)
+        env.register(agent)
+        env.reset()
+        np.random.seed(13)
+        actions = [agent.act(None) for _ in range(10)]
+        for action in actions:
+            env.step({agent.name: action})
+        history = env.agents[agent.name].actions.iloc[:11]
+        snapshot = env.fork()
+        self.assertIs(snapshot._prices_buffer, env._prices_buffer)
+        # alternative rollouts
+        action = agent.act(None)
+        _, reward, _, _ = env.step({agent.name: action})
+        env.step({agent.name: agent.act(None)})
+        branch = snapshot.fork()
+        branch_actions = [action, np.eye(len(env.universe))[0]]
+        _, branch_reward, _, _ = branch.step({agent.name: branch_actions[0]})
+        self.assertEqual(reward, branch_reward)
+        _, _, _, branch_info = branch.step(
+            {agent.name: branch_actions[1]})
+        # shared history is untouched
+        for _env in [env, branch, snapshot]:
+            np.testing.assert_array_equal(
+                _env.agents[agent.name].actions.iloc[:11], history)
+        self.assertFalse(np.allclose(
+            env.agents[agent.name].actions.iloc[12],
+            branch.agents[agent.name].actions.iloc[12]))
+        # restore snapshot
+        env.restore(snapshot)
+        self.assertEqual(env._counter, 10)
+        _, restored_reward, _, restored_info = env.step(
+            {agent.name: action})
+        self.assertEqual(reward, restored_reward)
+        # wealth levels of a straight-line rollout with the same actions
+        line = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        line.register(agent)
+        line.reset()
+        for i, _action in enumerate(actions + branch_actions):
+            _, _, _, line_info = line.step({agent.name: _action})
+            if i == len(actions):
+                # first step after the snapshot, as the restored `env`
+                np.testing.assert_array_equal(
+                    restored_info['wealth'][agent.name],
+                    line_info['wealth'][agent.name])
+                np.testing.assert_array_equal(
+                    env._wealth[0, :12], line._wealth[0, :12])
+                np.testing.assert_array_equal(
+                    env.agents[agent.name].pnl.values[:12],
+                    line.agents[agent.name].pnl.values[:12])
+        np.testing.assert_array_equal(branch_info['wealth'][agent.name],
+                                      line_info['wealth'][agent.name])
+        np.testing.assert_array_equal(branch._wealth, line._wealth)
+        np.testing.assert_array_equal(branch.agents[agent.name].pnl.values,
+                                      line.agents[agent.name].pnl.values)
+        # unregister after fork keeps the shared history of the fork
+        env.register(qtrader.agents.UniformAgent(env.action_space))
+        env.reset()
+        A = np.stack([actions[0], np.eye(len(env.universe))[0]])
+        env.step(A)
+        snapshot = env.fork()
+        env.unregister(agent)
+        np.testing.assert_array_equal(
+            snapshot.agents[agent.name].actions.iloc[1], A[0])
+        np.testing.assert_array_equal(
+            snapshot.agents['uniform'].actions.iloc[1], A[1])
+
+    def test__BaseEnv_render(self):
+        """Test `qtrader.envs.BaseEnv.render` method."""
+        import matplotlib
+        matplotlib.use('Agg')
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        agent = qtrader.agents.UniformAgent(env.action_space)
+        env.register(agent)
+        ob = env.reset()
+        done = False
+        frames = []
+        while not done:
+            ob, _, done, _ = env.step({agent.name: agent.act(ob)})
+            frame = env.render(mode='rgb_array', refresh_rate=50)
+            if frame is not None:
+                frames.append(frame)
+        # throttled frames, including the last step
+        self.assertEqual(len(frames), (len(env.dates) - 1) // 50 + 1)
+        self.assertEqual(frames[0].ndim, 3)
+        # artists updated in place
+        line = env._artists['pnl'][agent.name]
+        np.testing.assert_array_equal(line.get_ydata(),
+                                      env.agents[agent.name].pnl.values)
+        # next episode of the same bounds, from scratch
+        ob = env.reset()
+        for _ in range(3):
+            ob, _, _, _ = env.step({agent.name: agent.act(ob)})
+            self.assertEqual(env.render(mode='rgb_array').ndim, 3)
+        line = env._artists['pnl'][agent.name]
+        np.testing.assert_array_equal(line.get_ydata(),
+                                      env.agents[agent.name].pnl.values[:4])
+        self.assertEqual(env._axes[1].get_ylim(), (0.95, 1.05))
+        # back to an earlier snapshot
+        snapshot = env.fork()
+        for _ in range(2):
+            env.step({agent.name: agent.act(ob)})
+            env.render(mode='rgb_array')
+        env.restore(snapshot)
+        env.step({agent.name: agent.act(ob)})
+        self.assertEqual(env.render(mode='rgb_array').ndim, 3)
+
+    def test__BaseEnv_tournament(self):
+        """Test `qtrader.envs.BaseEnv` columnar multi-agent records."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        agents = [qtrader.agents.RandomAgent(env.action_space)
+                  for _ in range(20)]
+        for i, agent in enumerate(agents):
+            agent._id = 'random_%d' % i
+            env.register(agent)
+        self.assertEqual(env._actions.shape,
+                         (20, len(env.dates), len(env.universe)))
+        env.reset()
+        np.random.seed(13)
+        A = np.stack([agent.act(None) for agent in agents])
+        # matrix interface
+        _, reward, _, _ = env.step(A)
+        self.assertEqual(reward.shape, (20,))
+        # dict interface
+        env.reset()
+        _, _reward, _, _ = env.step(
+            {agent.name: a for agent, a in zip(agents, A)})
+        np.testing.assert_array_equal(reward, list(_reward.values()))
+        # records are views
+        self.assertTrue(np.shares_memory(env.agents['random_3']._actions,
+                                         env._actions))
+        np.testing.assert_array_equal(
+            env.agents['random_3'].actions.iloc[1], A[3])
+        # unregister keeps records of remaining agents
+        env.unregister(agents[0])
+        np.testing.assert_array_equal(
+            env.agents['random_3'].actions.iloc[1], A[3])
+        self.assertEqual(env._actions.shape[0], 19)
+        self.assertTrue(np.shares_memory(env.agents['random_19']._actions,
+                                         env._actions[18]))
+        # registration grows buffers geometrically, keeping records
+        for i in range(20, 40):
+            agent = qtrader.agents.RandomAgent(env.action_space)
+            agent._id = 'random_%d' % i
+            env.register(agent)
+        # doubled from the 20 rows allocated by `reset`
+        self.assertEqual(len(env._buffers[0]), 40)
+        self.assertEqual(env._actions.shape[0], 39)
+        np.testing.assert_array_equal(
+            env.agents['random_19'].actions.iloc[1], A[19])
+        self.assertTrue(np.isnan(env.agents['random_39']._actions[1]).all())
+        np.testing.assert_array_equal(env.agents['random_39'].pnl.iloc[:1],
+                                      [1.0])
+        # invalid action of one agent
+        A = np.concatenate([A[1:], A[1:]])[:39]
+        A[5] *= 2
+        with self.assertRaises(ValueError):
+            env.step(A)
+
+    def test__PortfolioVector(self):
+        """Test `qtrader.envs.spaces.PortfolioVector` class."""
+        space = qtrader.envs.spaces.PortfolioVector(4, long_only=True)
+        np.random.seed(13)
+        X = np.random.normal(0, 1, (100, 4))
+        X[:50] = [space.sample() for _ in range(50)]
+        np.testing.assert_array_equal(space.contains_many(X),
+                                      [space.contains(x) for x in X])
+        W = space.project(X)
+        self.assertTrue(space.contains_many(W).all())
+        # valid vectors are fixed points
+        np.testing.assert_allclose(W[:50], X[:50])
+        # optimality: no feasible perturbation gets closer
+        for x, w in zip(X[50:], W[50:]):
+            for v in [space.sample() for _ in range(20)]:
+                self.assertLessEqual(np.sum((x - w) ** 2),
+                                     np.sum((x - v) ** 2) + 1e-12)
+        np.testing.assert_allclose(
+            space.project(np.array([0.5, 0.5, 0.5, -1.0])),
+            [1 / 3, 1 / 3, 1 / 3, 0.0])
+        # budget hyperplane
+        unconstrained = qtrader.envs.spaces.PortfolioVector(4)
+        self.assertTrue(unconstrained.contains_many(
+            unconstrained.project(X)).all())
+
+    def test__BaseEnv_repair(self):
+        """Test `qtrader.envs.BaseEnv` invalid actions repair."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), repair=True)
+        agent = qtrader.agents.UniformAgent(env.action_space)
+        env.register(agent)
+        env.reset()
+        env.step({agent.name: 2 * agent.act(None)})
+        self.assertTrue(env.action_space.contains(
+            env.agents[agent.name]._actions[1]))
+
+    def test__BaseEnv_accumulators(self):
+        """Test `qtrader.envs.BaseEnv` running statistics."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B',
+                                      reward='differential_sharpe_ratio')
+        agent = qtrader.agents.RandomAgent(env.action_space)
+        env.register(agent)
+        env.reset()
+        np.random.seed(13)
+        done = False
+        while not done:
+            _, reward, done, info = env.step({agent.name: agent.act(None)})
+        self.assertEqual(reward[agent.name],
+                         info['differential_sharpe_ratio'][agent.name])
+        # batch statistics
+        returns = env.agents[agent.name].rewards.sum(axis=1).iloc[1:]
+        econometric = qtrader.utils.econometric
+        self.assertAlmostEqual(info['wealth'][agent.name],
+                               env.agents[agent.name].pnl.iloc[-1])
+        self.assertAlmostEqual(info['mean'][agent.name], returns.mean())
+        self.assertAlmostEqual(info['std'][agent.name], returns.std())
+        self.assertAlmostEqual(info['sharpe_ratio'][agent.name],
+                               econometric.sharpe_ratio(returns))
+        # drawdown from the initial wealth level, as records summary
+        self.assertAlmostEqual(
+            info['max_drawdown'][agent.name],
+            econometric.max_drawdown(
+                env.agents[agent.name].rewards.sum(axis=1)).iloc[-1])
+
+    def test__Finance_store(self):
+        """Test `qtrader.envs.data_loader.Finance` binary store."""
+        Finance = qtrader.envs.data_loader.Finance
+        prices = _prices(num_assets=8)
+        with tempfile.TemporaryDirectory() as root:
+            csv = os.path.join(root, 'prices.csv')
+            store = os.path.join(root, 'prices')
+            prices.to_csv(csv, index_label='Date')
+            Finance.to_store(prices, store)
+            tickers = ['A5', 'A1', 'MISSING', 'A3']
+            expected = Finance.Prices(tickers, '2010-03', '2010-06', csv=csv)
+            df = Finance.Prices(tickers, '2010-03', '2010-06', store=store)
+            self.assertEqual(df.columns.tolist(), ['A5', 'A1', 'A3'])
+            np.testing.assert_array_equal(df.index, expected.index)
+            np.testing.assert_allclose(df.values, expected.values)
+            # environment construction
+            env = qtrader.envs.TradingEnv(tickers, store=store)
+            self.assertEqual(env.universe, ['A5', 'A1', 'A3', 'CASH'])
+
+    def test__Finance_csv(self):
+        """Test `qtrader.envs.data_loader.Finance` CSV projection."""
+        Finance = qtrader.envs.data_loader.Finance
+        prices = _prices(num_assets=12)
+        with tempfile.TemporaryDirectory() as root:
+            csv = os.path.join(root, 'prices.csv')
+            prices.iloc[::-1].to_csv(csv, index_label='Date')
+            tickers = ['A7', 'A2', 'MISSING', 'A10']
+            df = Finance.Prices(tickers, '2010-03', '2010-06', csv=csv)
+            self.assertEqual(df.columns.tolist(), ['A7', 'A2', 'A10'])
+            self.assertTrue((df.dtypes == qtrader.framework.DTYPE).all())
+            pd.testing.assert_frame_equal(
+                df, prices.loc['2010-03':'2010-06', ['A7', 'A2', 'A10']],
+                check_freq=False, check_index_type=False,
+                check_names=False)
+            # chunked reading
+            chunked = Finance.Prices(tickers, '2010-03', '2010-06',
+                                     csv=csv, chunksize=16)
+            pd.testing.assert_frame_equal(chunked, df)
+
+    def test__Finance_provider(self):
+        """Test `qtrader.envs.data_loader.Finance` providers."""
+        data_loader = qtrader.envs.data_loader
+        prices = _prices(num_assets=6)
+
+        class FlakyProvider(data_loader.LocalProvider):
+            """Provider failing on first request per ticker."""
+            attempts = collections.Counter()
+
+            def get(self, ticker, start_date=None, end_date=None):
+                self.attempts[ticker] += 1
+                if ticker != 'MISSING' and self.attempts[ticker] == 1:
+                    raise ConnectionError('flaky %s' % ticker)
+                return super().get(ticker, start_date, end_date)
+
+        with tempfile.TemporaryDirectory() as root:
+            for ticker in prices:
+                prices[ticker].to_csv(os.path.join(root, '%s.csv' % ticker))
+            tickers = ['A0', 'A4', 'MISSING', 'A2']
+            df, failures = data_loader.Finance.Prices(
+                tickers, freq='B', provider=FlakyProvider(root),
+                max_workers=2, backoff=0.0, return_failures=True)
+        self.assertEqual(df.columns.tolist(), ['A0', 'A4', 'A2'])
+        np.testing.assert_allclose(df.values, prices[['A0', 'A4', 'A2']])
+        self.assertEqual(list(failures), ['MISSING'])
+        # permanent failures are not retried
+        self.assertEqual(FlakyProvider.attempts['MISSING'], 1)
+        self.assertEqual(FlakyProvider.attempts['A0'], 2)
+
+    def test__Finance_cache(self):
+        """Test `qtrader.envs.data_loader.CachedProvider`."""
+        data_loader = qtrader.envs.data_loader
+        prices = _prices(num_assets=2)
+
+        class CountingProvider(data_loader.LocalProvider):
+            """Provider logging requested date ranges."""
+            requests = []
+
+            def get(self, ticker, start_date=None, end_date=None):
+                self.requests.append((ticker, start_date, end_date))
+                return super().get(ticker, start_date, end_date)
+
+        with tempfile.TemporaryDirectory() as root:
+            for ticker in prices:
+                prices[ticker].to_csv(os.path.join(root, '%s.csv' % ticker))
+            cache = os.path.join(root, 'cache')
+            provider = data_loader.CachedProvider(CountingProvider(root),
+                                                  cache)
+            middle = prices.index[100].strftime('%Y-%m-%d')
+            end = prices.index[-1].strftime('%Y-%m-%d')
+            # cold
+            head = provider.get('A0', end_date=middle)
+            self.assertEqual(provider.stats['misses'], 1)
+            np.testing.assert_allclose(head, prices['A0'][:middle])
+            # warm
+            provider.get('A0', end_date=middle)
+            self.assertEqual(provider.stats['hits'], 1)
+            self.assertEqual(len(CountingProvider.requests), 1)
+            # tail only fetched
+            full = provider.get('A0', end_date=end)
+            self.assertEqual(provider.stats['partial'], 1)
+            self.assertEqual(len(CountingProvider.requests), 2)
+            self.assertGreater(CountingProvider.requests[-1][1], middle)
+            np.testing.assert_allclose(full, prices['A0'])
+            # persistent, no temporary files left behind
+            self.assertEqual(os.listdir(cache), ['A0.pkl'])
+            df = data_loader.Finance.Prices(
+                ['A0', 'A1'], end_date=end, freq='B',
+                provider=CountingProvider(root), cache=cache)
+            np.testing.assert_allclose(df.values, prices.values)
+            self.assertEqual(len(CountingProvider.requests), 3)
+
+    def test__BaseEnv_cache(self):
+        """Test `qtrader.envs.cache.PanelCache`."""
+        panels = qtrader.envs.cache.panels
+        panels.clear()
+        prices = _prices()
+        env = qtrader.envs.TradingEnv(prices=prices, trading_period='B')
+        self.assertEqual((panels.hits, panels.misses), (0, 1))
+        # same content, different object: cache lookup
+        _env = qtrader.envs.TradingEnv(prices=prices.copy(),
+                                       trading_period='B')
+        self.assertEqual((panels.hits, panels.misses), (1, 1))
+        self.assertIs(_env._prices, env._prices)
+        np.testing.assert_array_equal(_env._returns_buffer,
+                                      env._returns_buffer)
+        # different frequency & content
+        qtrader.envs.TradingEnv(prices=prices, trading_period='W-FRI')
+        qtrader.envs.TradingEnv(prices=prices * 2, trading_period='B')
+        self.assertEqual((panels.hits, panels.misses), (1, 3))
+        # least-recently-used eviction
+        cache = qtrader.envs.cache.PanelCache(maxsize=2)
+        first = cache.get(prices, 'B')
+        cache.get(prices, 'W-FRI')
+        cache.get(prices, 'B')
+        cache.get(prices * 2, 'B')
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(prices, 'B'), first)
+        cache.get(prices, 'W-FRI')
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test__StreamEnv(self):
+        """Test `qtrader.envs.StreamEnv` against `qtrader.envs.BaseEnv`."""
+        prices = _prices(num_dates=60)
+        env = qtrader.envs.TradingEnv(prices=prices, trading_period='B',
+                                      window=5)
+        agent = qtrader.agents.RandomAgent(env.action_space)
+        env.register(agent)
+        with tempfile.TemporaryDirectory() as root:
+            # chunked reader of bars, restarted on reset
+            stream = qtrader.envs.StreamEnv(
+                lambda: (prices.iloc[i:i + 7] for i in range(0, 60, 7)),
+                window=5, path=root)
+            stream.register(agent)
+            self.assertEqual(stream.universe, env.universe)
+            np.random.seed(13)
+            A = np.stack([agent.act(None) for _ in range(len(prices))])
+            for _ in range(2):
+                ob, _ob = env.reset(), stream.reset()
+                done, t = False, 0
+                while not done:
+                    np.testing.assert_array_equal(_ob['prices'],
+                                                  ob['prices'])
+                    np.testing.assert_array_equal(_ob['returns'],
+                                                  ob['returns'])
+                    t += 1
+                    ob, reward, done, info = env.step(A[t:t + 1])
+                    _ob, _reward, _done, _info = stream.step(A[t:t + 1])
+                    np.testing.assert_allclose(_reward, reward)
+                    np.testing.assert_allclose(_info['wealth'],
+                                               info['wealth'])
+                    self.assertEqual(_done, done)
+                self.assertEqual(t, len(prices) - 1)
+            # bounded lookback window
+            self.assertEqual(stream._ring[0].shape, (10, len(env.universe)))
+            # append-only records
+            record, _record = env.agents[agent.name], stream.agents[agent.name]
+            for table in ('actions', 'rewards'):
+                pd.testing.assert_frame_equal(getattr(_record, table),
+                                              getattr(record, table),
+                                              check_freq=False,
+                                              check_index_type=False)
+            np.testing.assert_allclose(_record.pnl, record.pnl)
+            self.assertEqual(os.path.getsize(_record.path),
+                             len(prices) * _record.dtype.itemsize)
+            # invalid actions leave both environments in place
+            for _env in [env, stream]:
+                _env.reset()
+                with self.assertRaises(ValueError):
+                    _env.step(2 * A[1:2])
+                self.assertEqual(_env._counter, 0)
+            stream.close()
+            self.assertTrue(os.path.exists(root))
+        # temporary records are removed on close
+        stream = qtrader.envs.StreamEnv([prices])
+        stream.register(agent)
+        stream.reset()
+        self.assertTrue(os.path.exists(stream.path))
+        stream.close()
+        self.assertFalse(os.path.exists(stream.path))
+
+    def test__framework_DTYPE(self):
+        """Test `qtrader.framework.DTYPE` single precision."""
+        prices = _prices(num_dates=500)
+        np.random.seed(13)
+        W = np.random.dirichlet(np.ones(prices.shape[1] + 1), len(prices))
+        reports = {}
+        try:
+            for dtype in ('float64', 'float32'):
+                qtrader.framework.DTYPE = dtype
+                env = qtrader.envs.TradingEnv(prices=prices,
+                                              trading_period='B')
+                self.assertEqual(env._prices_buffer.dtype, dtype)
+                self.assertEqual(env._returns_buffer.dtype, dtype)
+                self.assertEqual(env.observation_space.dtype, dtype)
+                self.assertEqual(
+                    qtrader.utils.preprocessor.rolling2d(
+                        env._prices_buffer, 5).dtype, dtype)
+                record = env.evaluate(W)['strategy_0']
+                self.assertEqual(record._rewards.dtype, dtype)
+                # exactly as step-by-step execution
+                agent = qtrader.agents.UniformAgent(env.action_space)
+                env.register(agent)
+                env.reset()
+                for w in W[1:]:
+                    env.step(w[np.newaxis])
+                np.testing.assert_array_equal(
+                    env.agents[agent.name]._rewards, record._rewards)
+                np.testing.assert_array_equal(
+                    env.agents[agent.name]._actions, record._actions)
+                returns = record.rewards.sum(axis=1).iloc[1:]
+                reports[dtype] = qtrader.utils.summary.stats(
+                    returns.astype(float)).astype(float)
+        finally:
+            qtrader.framework.DTYPE = 'float64'
+        np.testing.assert_allclose(reports['float32'], reports['float64'],
+                                   rtol=1e-3, atol=1e-6)
+
+    def test__BaseEnv_share(self):
+        """Test `qtrader.envs.BaseEnv.share` zero-copy shared memory."""
+        env = qtrader.envs.TradingEnv(prices=_prices(), trading_period='B')
+        panel = env.share()
+        try:
+            # picklable descriptor, e.g. for child processes
+            descriptor = pickle.loads(pickle.dumps(panel.descriptor))
+            shared = qtrader.envs.shared.SharedPanel(
+                shared_memory.SharedMemory(name=descriptor.name), descriptor)
+            _env = qtrader.envs.TradingEnv(prices=descriptor, window=3)
+            self.assertEqual(_env.universe, env.universe)
+            np.testing.assert_array_equal(_env._returns_buffer,
+                                          env._returns_buffer)
+            self.assertTrue(np.shares_memory(_env._prices_buffer,
+                                             panel._values))
+            # finance loaders, zero-copy for adjacent tickers
+            prices = qtrader.envs.data_loader.Finance.Prices(
+                ['A1', 'A2'], end_date=str(env.dates[9].date()),
+                shared=descriptor)
+            self.assertEqual(prices.shape, (10, 2))
+            self.assertTrue(np.shares_memory(prices.values, panel._values))
+            returns = qtrader.envs.data_loader.Finance.Returns(
+                ['A3', 'A0', 'MISSING'], shared=descriptor)
+            pd.testing.assert_frame_equal(returns, env._returns[['A3', 'A0']],
+                                          check_freq=False,
+                                          check_index_type=False)
+            # read-only for attached processes
+            self.assertFalse(shared._values.flags.writeable)
+            del shared
+        finally:
+            del _env, prices, returns
+            panel.unlink()
+        # attached by a worker process, then freed
+        panel = env.share()
+        try:
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(1) as pool:
+                checksum = pool.apply(_checksum, (panel.descriptor,))
+            self.assertAlmostEqual(
+                checksum, np.nansum(env._prices_buffer) +
+                np.nansum(env._returns_buffer))
+        finally:
+            panel.unlink()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=panel.descriptor.name)
+
+    def test__Finance_build(self):
+        """Test `qtrader.envs.data_loader.Finance.build` resumable."""
+        data_loader = qtrader.envs.data_loader
+        prices = _prices(num_assets=6)
+
+        class BrokenProvider(data_loader.LocalProvider):
+            """Provider failing for ticker 'A3'."""
+
+            def get(self, ticker, start_date=None, end_date=None):
+                if ticker == 'A3':
+                    raise ConnectionError('broken %s' % ticker)
+                return super().get(ticker, start_date, end_date)
+
+        with tempfile.TemporaryDirectory() as fixture, \
+                tempfile.TemporaryDirectory() as root:
+            for ticker in prices:
+                prices[ticker].to_csv(
+                    os.path.join(fixture, '%s.csv' % ticker))
+            kwargs = dict(tickers=prices.columns.tolist(),
+                          end_date=str(prices.index[-1].date()),
+                          batch_size=4, max_workers=2, backoff=0.0)
+            report = data_loader.Finance.build(
+                root, provider=BrokenProvider(fixture), **kwargs)
+            self.assertEqual(list(report['failures']), ['A3'])
+            self.assertEqual(report['fetched'], 5)
+            # rerun resumes from checkpoints
+            report = data_loader.Finance.build(
+                root, provider=data_loader.LocalProvider(fixture), **kwargs)
+            self.assertEqual((report['fetched'], report['resumed']), (1, 5))
+            self.assertEqual(report['failures'], {})
+            self.assertGreater(report['throughput'], 0)
+            # CSV & binary store
+            tickers = prices.columns.tolist()
+            csv = data_loader.Finance.Prices(
+                tickers, csv=os.path.join(root, 'prices.csv'))
+            store = data_loader.Finance.Prices(
+                tickers, store=os.path.join(root, 'prices'))
+            np.testing.assert_allclose(csv.values, prices.values)
+            np.testing.assert_allclose(store.values, prices.values)
+            returns = data_loader.Finance.Returns(
+                tickers, store=os.path.join(root, 'returns'))
+            np.testing.assert_allclose(returns.values,
+                                       prices.pct_change().values[1:])
+
+    def test__BaseEnv_ragged(self):
+        """Test `qtrader.envs.BaseEnv` ragged universe."""
+        prices = _prices()
+        # late listing & early delisting
+        prices.iloc[:50, 1] = np.nan
+        prices.iloc[200:, 2] = np.nan
+        env = qtrader.envs.TradingEnv(prices=prices, trading_period='B',
+                                      ragged=True)
+        self.assertEqual(len(qtrader.envs.TradingEnv(
+            prices=prices, trading_period='B').dates), 150)
+        self.assertEqual(len(env.dates), len(prices))
+        self.assertEqual(env.listings.loc['A1', 'listed'], prices.index[50])
+        self.assertEqual(env.listings.loc['A2', 'delisted'],
+                         prices.index[199])
+        # dense rewards
+        self.assertFalse(np.isnan(env._returns_buffer[1:]).any())
+        agent = qtrader.agents.RandomAgent(env.action_space)
+        env.register(agent)
+        env.reset()
+        np.random.seed(13)
+        self.assertEqual(env.action_space.sample()[1], 0.0)
+        with self.assertRaises(ValueError):
+            env.step({agent.name: np.full(5, 0.2)})
+        # masked projection of invalid actions
+        env.repair = True
+        env.reset()
+        env.step({agent.name: np.full(5, 0.2)})
+        np.testing.assert_allclose(env.agents[agent.name].actions.iloc[1],
+                                   [0.25, 0.0, 0.25, 0.25, 0.25])
+        # vectorized evaluation matches stepping
+        W = np.random.dirichlet(np.ones(5), len(env.dates))
+        W[1:] *= env._listed[:-1]
+        W /= W.sum(axis=1, keepdims=True)
+        record = env.evaluate(W)['strategy_0']
+        env.reset()
+        rewards = []
+        for w in W[1:]:
+            self.assertTrue(env.action_space.contains(w))
+            _, reward, _, _ = env.step({agent.name: w})
+            rewards.append(reward[agent.name])
+        np.testing.assert_allclose(record.rewards.sum(axis=1)[1:], rewards)
+        self.assertTrue(np.isfinite(record.pnl).all())
+        # repair & evaluate
+        W = np.full((len(env.dates), 5), 0.2)
+        record = env.evaluate(W)['strategy_0']
+        self.assertEqual(record.actions['A1'].iloc[1:50].abs().sum(), 0.0)
+
 
 if __name__ == '__main__':
     unittest.main()
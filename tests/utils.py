@@ -0,0 +1,328 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+import qtrader
+
+
+def _returns(num_dates=1000, num_strategies=None, seed=13):
+    """Synthetic daily returns, with name `Strategy`."""
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range('2000-01-03', periods=num_dates, freq='B')
+    if num_strategies is None:
+        return pd.Series(rng.standard_t(4, num_dates) * 0.01 + 0.0003,
+                         index=dates, name='Strategy')
+    return pd.DataFrame(
+        rng.standard_t(4, (num_dates, num_strategies)) * 0.01 + 0.0003,
+        index=dates, columns=['S%d' % k for k in range(num_strategies)])
+
+
+class TestUtils(unittest.TestCase):
+    """Test `qtrader.utils` package."""
+
+    def test__summary_stats(self):
+        """Test `qtrader.utils.summary.stats` fused metrics."""
+        econometric = qtrader.utils.econometric
+        returns = _returns()
+        expected = {
+            'Mean Returns': econometric.mean_returns(returns),
+            'Cumulative Returns': econometric.cum_returns(returns).iloc[-1],
+            'Volatility': econometric.std_returns(returns),
+            'Sharpe Ratio': econometric.sharpe_ratio(returns),
+            'Max Drawdown': econometric.max_drawdown(returns).iloc[-1],
+            'Average Drawdown Time':
+                econometric.average_drawdown_time(returns).days,
+            'Skewness': econometric.skewness(returns),
+            'Kurtosis': econometric.kurtosis(returns),
+            'Tail Ratio': econometric.tail_ratio(returns),
+            'Value at Risk': econometric.value_at_risk(returns),
+            'Conditional Value at Risk':
+                econometric.conditional_value_at_risk(returns),
+            'Hit Ratio': econometric.hit_ratio(returns),
+            'Average Win to Average Loss': econometric.awal(returns),
+            'Average Profitability Per Trade': econometric.appt(returns)
+        }
+        table = qtrader.utils.summary.stats(returns)
+        self.assertEqual(table.index.tolist(), list(expected))
+        self.assertEqual(table.name, 'Strategy')
+        self.assertEqual(table['Average Drawdown Time'],
+                         expected['Average Drawdown Time'])
+        np.testing.assert_allclose(table.values.astype(float),
+                                   list(expected.values()), rtol=1e-9)
+        # missing returns skipped, as `pandas`, e.g. `pct_change`
+        returns.iloc[0] = np.nan
+        table = qtrader.utils.summary.stats(returns)
+        np.testing.assert_allclose(
+            table.values.astype(float),
+            qtrader.utils.summary.stats(returns.dropna()).values.astype(float),
+            rtol=1e-12)
+        for label, function in [
+                ('Mean Returns', econometric.mean_returns),
+                ('Volatility', econometric.std_returns),
+                ('Skewness', econometric.skewness),
+                ('Kurtosis', econometric.kurtosis)]:
+            self.assertAlmostEqual(table[label], function(returns), msg=label)
+        self.assertAlmostEqual(table['Max Drawdown'],
+                               econometric.max_drawdown(returns).iloc[-1])
+        self.assertEqual(table['Average Drawdown Time'],
+                         econometric.average_drawdown_time(returns).days)
+        self.assertTrue(np.isnan(econometric.skewness(returns.values)))
+        self.assertTrue(np.isnan(econometric.kurtosis(returns.values)))
+
+    def test__summary_stats_matrix(self):
+        """Test `qtrader.utils.summary.stats` of (T, K) returns."""
+        returns = _returns(num_strategies=20)
+        table = qtrader.utils.summary.stats(returns)
+        self.assertEqual(table.shape, (20, 14))
+        self.assertEqual(table.index.tolist(), returns.columns.tolist())
+        for strategy in returns:
+            np.testing.assert_allclose(
+                table.loc[strategy].values,
+                qtrader.utils.summary.stats(
+                    returns[strategy]).values.astype(float),
+                rtol=1e-12)
+        # missing returns skipped per strategy, e.g. unlisted
+        missing = returns.copy()
+        missing.iloc[0] = np.nan
+        missing.iloc[:300, 3] = np.nan
+        missing.iloc[500:, 7] = np.nan
+        missing.iloc[::7, 11] = np.nan
+        missing['S13'] = np.nan
+        metrics = qtrader.utils.econometric.metrics
+        for dates in [missing.index, None]:
+            table = metrics(missing.values, dates)
+            # undefined without returns
+            self.assertTrue(np.isnan([value[13]
+                                      for value in table.values()]).all())
+            for k, strategy in enumerate(missing.columns[:13]):
+                column = missing[strategy].dropna()
+                expected = metrics(column.values, None if dates is None
+                                   else column.index)
+                for key, value in expected.items():
+                    np.testing.assert_allclose(
+                        table[key][k], value, rtol=1e-9,
+                        err_msg='%s %s' % (strategy, key))
+        # unlabelled, drawdown time in periods
+        table = qtrader.utils.summary.stats(returns.values)
+        self.assertEqual(table.index[0], 'strategy_0')
+        np.testing.assert_allclose(
+            table['Average Drawdown Time'].values,
+            qtrader.utils.econometric.average_drawdown_time(returns.values))
+
+    def test__econometric_matrix(self):
+        """Test `qtrader.utils.econometric` column-wise on (T, K) arrays."""
+        econometric = qtrader.utils.econometric
+        returns = _returns(num_strategies=5)
+        for function in [econometric.mean_returns,
+                         econometric.std_returns,
+                         econometric.skewness,
+                         econometric.kurtosis,
+                         econometric.tail_ratio,
+                         econometric.value_at_risk,
+                         econometric.conditional_value_at_risk,
+                         econometric.hit_ratio,
+                         econometric.awal,
+                         econometric.appt,
+                         econometric.max_drawdown,
+                         econometric.average_drawdown_time]:
+            matrix = function(returns.values)
+            for k, strategy in enumerate(returns):
+                np.testing.assert_allclose(
+                    matrix[..., k], function(returns[strategy].values),
+                    rtol=1e-12, err_msg=function.__name__)
+        # dates, as `pandas.Timedelta` per strategy
+        durations = econometric.average_drawdown_time(returns)
+        for strategy in returns:
+            self.assertEqual(
+                durations[strategy],
+                econometric.average_drawdown_time(returns[strategy]))
+
+    def test__drawdown_episodes(self):
+        """Test `qtrader.utils.econometric.drawdown_episodes`."""
+        econometric = qtrader.utils.econometric
+        returns = _returns(num_dates=500)
+        # reference, scanning the prefix of every date
+        cum_returns = econometric.cum_returns(returns).values
+        _drawdown = np.array([cum_returns[:t + 1].max() - cum_returns[t]
+                              for t in range(len(cum_returns))])
+        np.testing.assert_allclose(
+            econometric._drawdown(returns).values[1:], _drawdown[1:])
+        expected, t = [], 1
+        while t < len(_drawdown):
+            if _drawdown[t] > 0:
+                start = t
+                while t < len(_drawdown) and _drawdown[t] > 0:
+                    t = t + 1
+                expected.append(
+                    (start - 1, start + np.argmax(_drawdown[start:t]), t,
+                     _drawdown[start:t].max()))
+            t = t + 1
+        expected = np.array(expected)
+        episodes = econometric.drawdown_episodes(returns.values)
+        np.testing.assert_array_equal(
+            episodes[['peak', 'trough']].values, expected[:, :2])
+        np.testing.assert_array_equal(
+            episodes['recovery'].fillna(len(returns)).values, expected[:, 2])
+        np.testing.assert_allclose(episodes['depth'].values, expected[:, 3])
+        self.assertAlmostEqual(episodes['depth'].max(),
+                               econometric.max_drawdown(returns).iloc[-1])
+        # dates
+        episodes = econometric.drawdown_episodes(returns)
+        self.assertEqual(episodes['peak'].iloc[0],
+                         returns.index[int(expected[0, 0])])
+        self.assertEqual(econometric.max_drawdown_duration(returns),
+                         episodes['duration'].max())
+        self.assertEqual(econometric.average_drawdown_duration(returns),
+                         episodes['duration'].mean())
+        # column-wise
+        returns = _returns(num_dates=500, num_strategies=4)
+        durations = econometric.max_drawdown_duration(returns.values)
+        for k, strategy in enumerate(returns):
+            self.assertEqual(durations[k], econometric.max_drawdown_duration(
+                returns[strategy].values))
+        np.testing.assert_allclose(
+            econometric.average_drawdown_duration(returns.values),
+            [econometric.drawdown_episodes(returns[strategy].values)
+             ['duration'].mean() for strategy in returns])
+
+    def test__online_estimators(self):
+        """Test `qtrader.utils.online` against batch metrics."""
+        econometric = qtrader.utils.econometric
+        online = qtrader.utils.online
+        returns = _returns()
+        estimators = {
+            econometric.mean_returns: online.Mean(),
+            econometric.std_returns: online.Std(),
+            econometric.sharpe_ratio: online.SharpeRatio(),
+            econometric.skewness: online.Skewness(),
+            econometric.kurtosis: online.Kurtosis(),
+            econometric.hit_ratio: online.HitRatio(),
+            econometric.awal: online.WinLoss(),
+            econometric.value_at_risk: online.QuantileSketch(),
+        }
+        max_drawdown = online.MaxDrawdown()
+        for r in returns.values:
+            max_drawdown.update(r)
+            for estimator in estimators.values():
+                estimator.update(r)
+        for function, estimator in estimators.items():
+            self.assertEqual(estimator.count, len(returns))
+            # sketch within its relative accuracy
+            rtol = 2 * estimator.alpha if \
+                isinstance(estimator, online.QuantileSketch) else 1e-9
+            np.testing.assert_allclose(
+                estimator.value(), function(returns), rtol=rtol,
+                err_msg=function.__name__)
+        np.testing.assert_allclose(
+            max_drawdown.value(), econometric.max_drawdown(returns).iloc[-1])
+        np.testing.assert_allclose(
+            estimators[econometric.awal].appt, econometric.appt(returns))
+        np.testing.assert_allclose(
+            estimators[econometric.value_at_risk].conditional_value(),
+            econometric.conditional_value_at_risk(returns), rtol=1e-2)
+        # peak of the initial wealth level, as `envs` accumulators
+        losses = np.concatenate([[-0.02, -0.01], returns.values[:50]])
+        initial = online.MaxDrawdown(initial=True)
+        std, sharpe_ratio = online.Std(), online.SharpeRatio()
+        accumulators = qtrader.envs.accumulators.Accumulators(1)
+        for r in losses:
+            for estimator in [initial, std, sharpe_ratio]:
+                estimator.update(r)
+            accumulators.update(np.array([r]))
+        np.testing.assert_allclose(
+            initial.value(),
+            econometric.max_drawdown(np.concatenate([[0.0], losses]))[-1])
+        self.assertEqual(accumulators.max_drawdown[0], initial.value())
+        self.assertEqual(accumulators.wealth[0], initial.wealth)
+        self.assertEqual(accumulators.std[0], std.value())
+        self.assertEqual(accumulators.sharpe_ratio[0], sharpe_ratio.value())
+        # strategies, broadcasting
+        returns = _returns(num_strategies=3)
+        skewness = online.Skewness()
+        for r in returns.values:
+            skewness.update(r)
+        np.testing.assert_allclose(
+            skewness.value(), econometric.skewness(returns.values))
+
+    def test__rolling_metrics(self):
+        """Test `qtrader.utils.econometric` rolling metrics
+        against the metrics of each window."""
+        econometric = qtrader.utils.econometric
+        returns = _returns(num_dates=300, num_strategies=3)
+        window = 37
+        _cum_returns = econometric.cum_returns(returns.values)
+        for rolling, function in [
+                (econometric.rolling_mean_returns, econometric.mean_returns),
+                (econometric.rolling_std_returns, econometric.std_returns),
+                (econometric.rolling_sharpe_ratio, econometric.sharpe_ratio),
+                (econometric.rolling_value_at_risk,
+                 econometric.value_at_risk),
+                (econometric.rolling_conditional_value_at_risk,
+                 econometric.conditional_value_at_risk)]:
+            table = rolling(returns, window)
+            pd.testing.assert_index_equal(table.index, returns.index)
+            self.assertTrue(table.iloc[:window - 1].isnull().values.all())
+            expected = [function(returns.values[t - window + 1:t + 1])
+                        for t in range(window - 1, len(returns))]
+            np.testing.assert_allclose(
+                table.values[window - 1:], expected,
+                rtol=1e-9, atol=1e-15, err_msg=rolling.__name__)
+        # drawdown from the peak of each window
+        expected = [_cum_returns[t - window + 1:t + 1].max(axis=0) -
+                    _cum_returns[t] for t in range(window - 1, len(returns))]
+        np.testing.assert_allclose(
+            econometric.rolling_drawdown(returns.values, window)[window - 1:],
+            expected)
+        # vector
+        np.testing.assert_allclose(
+            econometric.rolling_sharpe_ratio(returns['S1'], window).values,
+            econometric.rolling_sharpe_ratio(returns, window)['S1'].values)
+        # ties & bounds of `cutoff`
+        ties = np.round(returns.values, 2)
+        for cutoff in [0.0, 0.05, 0.5, 1.0]:
+            for rolling, function in [
+                    (econometric.rolling_value_at_risk,
+                     econometric.value_at_risk),
+                    (econometric.rolling_conditional_value_at_risk,
+                     econometric.conditional_value_at_risk)]:
+                expected = [function(ties[t - window + 1:t + 1], cutoff)
+                            for t in range(window - 1, len(ties))]
+                np.testing.assert_allclose(
+                    rolling(ties, window, cutoff)[window - 1:], expected,
+                    rtol=1e-9, atol=1e-15, err_msg=rolling.__name__)
+                with self.assertRaises(ValueError):
+                    rolling(ties, window, 1.5)
+        rollings = [econometric.rolling_mean_returns,
+                    econometric.rolling_std_returns,
+                    econometric.rolling_sharpe_ratio,
+                    econometric.rolling_value_at_risk,
+                    econometric.rolling_conditional_value_at_risk,
+                    econometric.rolling_drawdown]
+        # shorter than a window, undefined
+        for rolling in rollings:
+            table = rolling(returns.iloc[:window - 1], window)
+            self.assertEqual(table.shape, (window - 1, 3))
+            self.assertTrue(table.isnull().values.all())
+        # missing returns, undefined for the windows containing them
+        missing = returns.copy()
+        missing.iloc[100, 1] = np.nan
+        for rolling in rollings:
+            table, expected = rolling(missing, window), rolling(returns, window)
+            self.assertTrue(table['S1'].iloc[100:100 + window].isnull().all())
+            for columns, rows in [(['S0', 'S2'], slice(None)),
+                                  (['S1'], slice(None, 100))]:
+                np.testing.assert_allclose(
+                    table[columns].values[rows], expected[columns].values[rows],
+                    err_msg=rolling.__name__)
+            # windows after the missing return
+            rows = slice(100 + window, None)
+            if rolling is econometric.rolling_drawdown:
+                # skipping the missing return, as `pandas.cumprod`
+                expected = rolling(missing.fillna(0), window)
+            np.testing.assert_allclose(
+                table['S1'].values[rows], expected['S1'].values[rows],
+                rtol=1e-9, err_msg=rolling.__name__)
+
+
+if __name__ == '__main__':
+    unittest.main()